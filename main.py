@@ -7,12 +7,16 @@ from datetime import datetime, timedelta, timezone
 
 from src.config import Config
 from src.factory import create_content
+from src.gen import gemini_client, subtitles
+from src.gen.script_cache import get_script_cache
+from src.rendering.fonts import get_font_registry
 from src.sources.tiktok_downloader import TikTokDownloader
 from src.upload_engine.playwright_uploader import (
     upload_video_via_browser,
     verify_login_status,
 )
 from src.utils.db import Channel, SessionLocal, UploadHistory
+from src.utils.job_manifest import find_incomplete_jobs
 from src.utils.logging_config import setup_logging
 from src.utils.notifications import send_telegram_message, send_upload_report
 
@@ -230,6 +234,12 @@ async def process_genai_channel(channel, db):
 
     shuffled_topics = list(topics)
     random.shuffle(shuffled_topics)
+    # Topics with an interrupted job go first, so a retry resumes that job
+    channel_dir = f"data/output/{channel.channel_name}"
+    interrupted = {
+        job.get("topic") for job in find_incomplete_jobs(channel_dir, language=lang)
+    }
+    shuffled_topics.sort(key=lambda t: t not in interrupted)
 
     topic = None
     item_id = None
@@ -254,6 +264,7 @@ async def process_genai_channel(channel, db):
             language=lang,
             quality=quality,
             voice=voice,
+            resume=True,
         )
         if video_path and os.path.exists(video_path):
             title = f"{topic} #shorts"
@@ -308,6 +319,8 @@ async def run_full_cycle():
                 await process_genai_channel(channel, db)
     finally:
         db.close()
+    get_script_cache().log_summary()
+    gemini_client.log_summaries()
     logger.info("Cycle finished.")
 
 
@@ -342,6 +355,9 @@ async def run_for_channel(account_name, channel_name):
 
 async def main_loop():
     logger.info("Starting Automation Engine (Loop mode)...")
+    get_font_registry().report()
+    # Load the local whisper model before the first job needs it
+    await asyncio.to_thread(subtitles.warm_up)
     while True:
         try:
             await run_full_cycle()
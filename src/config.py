@@ -22,6 +22,13 @@ class Config:
         "GEMINI_API_KEY"
     )
     GEMINI_MODEL_ID = os.environ.get("GEMINI_MODEL_ID") or "gemini-2.5-flash-lite"
+    # Async Gemini client: requests in flight, request starts per minute (0 = no
+    # limit) and retries of transient errors with jittered exponential backoff
+    GEMINI_MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", 4))
+    GEMINI_REQUESTS_PER_MINUTE = int(os.environ.get("GEMINI_REQUESTS_PER_MINUTE", 60))
+    GEMINI_MAX_RETRIES = int(os.environ.get("GEMINI_MAX_RETRIES", 5))
+    GEMINI_BACKOFF_BASE = float(os.environ.get("GEMINI_BACKOFF_BASE", 1.0))
+    GEMINI_BACKOFF_MAX = float(os.environ.get("GEMINI_BACKOFF_MAX", 30.0))
 
     # Pexels
     PEXELS_API_KEY = os.environ.get("PEXELS_API_KEY")
@@ -44,6 +51,62 @@ class Config:
     else:
         DATABASE_URL = os.environ.get("DATABASE_URL") or DEFAULT_DB
 
+    # Rendering
+    # "moviepy" (default) or "ffmpeg" (single native filtergraph, MoviePy as fallback)
+    RENDER_BACKEND = os.environ.get("RENDER_BACKEND", "moviepy").lower()
+    # "sprites" (PIL-rendered words) or "ass" (libass burn-in of an exported .ass track)
+    SUBTITLE_MODE = os.environ.get("SUBTITLE_MODE", "sprites").lower()
+    # Word timing sources tried in order: "tts" (edge-tts word boundaries),
+    # "whisper" (local model), "assemblyai", "gemini"
+    SUBTITLES_PROVIDER = os.environ.get("SUBTITLES_PROVIDER", "tts,assemblyai").lower()
+    # Local whisper: model size, torch threads and optional core ids ("6,7" or
+    # "6-7") the worker process is pinned to, leaving the other cores to renders
+    WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "base")
+    WHISPER_THREADS = int(os.environ.get("WHISPER_THREADS", 2))
+    WHISPER_CPUS = os.environ.get("WHISPER_CPUS", "")
+    # Parallel MoviePy segments per render: "1" (off), a number, or "auto" (cores / 2)
+    RENDER_SEGMENTS = os.environ.get("RENDER_SEGMENTS", "1").lower()
+    # Stock clips are normalized into render-ready intermediates reused across
+    # renders. Off by default: a cold cache adds a transcode to every render
+    MEZZANINE_CACHE = os.environ.get("MEZZANINE_CACHE", "False").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+    MEZZANINE_CACHE_DIR = os.environ.get("MEZZANINE_CACHE_DIR", "data/cache/mezzanine")
+    MEZZANINE_CACHE_MAX_MB = int(os.environ.get("MEZZANINE_CACHE_MAX_MB", 5120))
+    # Finished renders keyed by an input fingerprint
+    RENDER_CACHE = os.environ.get("RENDER_CACHE", "True").lower() in ("true", "1", "t")
+    RENDER_CACHE_DIR = os.environ.get("RENDER_CACHE_DIR", "data/cache/renders")
+    RENDER_CACHE_MAX_MB = int(os.environ.get("RENDER_CACHE_MAX_MB", 10240))
+    # Renders encoding at once in a process; the cores are split evenly between
+    # them and further renders queue. "auto" = one per 4 cores
+    RENDER_MAX_CONCURRENT = os.environ.get("RENDER_MAX_CONCURRENT", "auto").lower()
+
+    # Batch production (create_content_batch)
+    # Concurrent Gemini/TTS/transcription calls and stock footage downloads
+    BATCH_API_CONCURRENCY = int(os.environ.get("BATCH_API_CONCURRENCY", 4))
+    BATCH_DOWNLOAD_CONCURRENCY = int(os.environ.get("BATCH_DOWNLOAD_CONCURRENCY", 8))
+    # Render processes; 0 = as many as the render governor admits at once
+    BATCH_RENDER_WORKERS = int(os.environ.get("BATCH_RENDER_WORKERS", 0))
+    # Pooled keep-alive connections per host for Pexels
+    HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", 16))
+
+    # Scripts
+    # Stream the Gemini response and start footage downloads per finished scene
+    SCRIPT_STREAMING = os.environ.get("SCRIPT_STREAMING", "True").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+    # Generated scripts reused by topic/language/model/prompt version
+    SCRIPT_CACHE = os.environ.get("SCRIPT_CACHE", "True").lower() in ("true", "1", "t")
+    SCRIPT_CACHE_DIR = os.environ.get("SCRIPT_CACHE_DIR", "data/cache/scripts")
+    SCRIPT_CACHE_MAX_MB = int(os.environ.get("SCRIPT_CACHE_MAX_MB", 64))
+    SCRIPT_CACHE_TTL_HOURS = float(os.environ.get("SCRIPT_CACHE_TTL_HOURS", 168))
+    # Topics per Gemini request in generate_scripts_batch
+    SCRIPT_BATCH_SIZE = int(os.environ.get("SCRIPT_BATCH_SIZE", 5))
+
     # Server
     PORT = int(os.environ.get("PORT", 5000))
 
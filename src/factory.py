@@ -1,102 +1,588 @@
+import contextlib
 import logging
+import multiprocessing
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 # Add project root to sys.path to support 'from src...' imports when run directly
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from src.config import Config
 from src.gen import script_generator, subtitles, tts, visuals
 from src.rendering.engine import VideoRenderer
+from src.rendering.ffmpeg_backend import probe_media
+from src.rendering.governor import configure_render_governor, get_render_governor
+from src.utils.job_manifest import JobManifest, find_latest_job
+from src.utils.stage_dag import StageDAG, StageFailed
 
 logger = logging.getLogger(__name__)
 
 
+def _new_job_dir(channel_dir):
+    """Creates a fresh timestamped job directory (suffixed if the second is taken)."""
+    stamp = int(time.time())
+    suffix = 0
+    while True:
+        path = f"{channel_dir}/{stamp}" + (f"_{suffix}" if suffix else "")
+        try:
+            os.makedirs(path)
+            return path
+        except FileExistsError:
+            suffix += 1
+
+
+def _render(job):
+    """Renders one short; module level so it can run in a render process pool."""
+    # The quality names an encoding profile, which also sets resolution and fps
+    renderer = VideoRenderer.from_quality(job["quality"])
+    renderer.assemble_short(
+        job["audio"],
+        job["visuals"],
+        subtitles=job["subtitles"],
+        output_path=job["output_path"],
+        quality=job["quality"],
+        backend=job["backend"],
+        subtitle_mode=job["subtitle_mode"],
+    )
+    return job["output_path"]
+
+
+def _init_render_worker(threads):
+    """Render pool initializer: the worker's renders use `threads` encoder threads."""
+    configure_render_governor(cpu_count=threads, max_concurrent=1)
+
+
+def _limited(fn, semaphore):
+    """Wraps a stage so it runs only while holding `semaphore`."""
+
+    def run(**deps):
+        with semaphore:
+            return fn(**deps)
+
+    return run
+
+
+def _fetch_scene_visual(i, scene, topic, base_dir, used_visual_urls, lock):
+    """
+    Downloads a unique stock clip for scene `i`; returns its path or None.
+    `lock` guards `used_visual_urls`, which concurrent scene fetches share.
+    """
+    scene_keywords = scene.get("keywords", [])
+    if not scene_keywords:
+        scene_keywords = [topic]
+
+    # Fetch up to 2 unique visuals per scene to ensure variety
+    for k in range(min(len(scene_keywords), 2)):
+        query = scene_keywords[k]
+        v_path = os.path.join(base_dir, f"scene_{i}_v{k}.mp4")
+
+        with lock:
+            used_urls = set(used_visual_urls)
+        downloaded, video_url = visuals.get_stock_footage(
+            query, v_path, used_urls=used_urls
+        )
+        if downloaded:
+            with lock:
+                used_visual_urls.add(video_url)
+            logger.info(f"Downloaded unique visual for: {query}")
+            # We stop at 1 if it's broad enough, but for complex topics we take 2
+            return downloaded
+        logger.warning(f"Could not download visual for {query}")
+    return None
+
+
+def _fetch_visuals(script_data, topic, base_dir, semaphore=None):
+    """
+    Downloads one unique stock clip per scene; returns the local paths.
+    Each scene's download holds `semaphore`, if given.
+    """
+    # Track downloaded clips to ensure we don't repeat the same clip too often
+    used_visual_urls = set()
+    lock = threading.Lock()
+    visual_paths = []
+    for i, scene in enumerate(script_data.get("scenes", [])):
+        with semaphore or contextlib.nullcontext():
+            visual_paths.append(
+                _fetch_scene_visual(i, scene, topic, base_dir, used_visual_urls, lock)
+            )
+    visual_paths = [path for path in visual_paths if path]
+    if not visual_paths:
+        logger.error("No visuals downloaded.")
+    return visual_paths
+
+
 def create_content(
-    topic, channel_name="TestChannel", language="ru", quality="easy", voice=None
+    topic,
+    channel_name="TestChannel",
+    language="ru",
+    quality="easy",
+    voice=None,
+    backend=None,
+    subtitle_mode=None,
+    resume=False,
+    render_pool=None,
+    limits=None,
 ):
     """
     Full pipeline to create a video from a topic.
+    `backend` selects the render backend ("moviepy" or "ffmpeg") and `subtitle_mode`
+    the subtitle rendering ("sprites" or "ass"); both default to the config.
+
+    The steps run as a stage DAG: once the script exists, the voiceover and
+    transcription branch runs alongside the stock footage downloads, and the
+    render starts when both are done.
+
+    Every finished stage is recorded in the job directory's manifest.json. With
+    `resume`, the latest job for the same topic and language is continued: stages
+    whose results and files are still valid are skipped, so a retry only pays for
+    the stage that failed.
+
+    `render_pool` (an executor) runs the render out of process, and `limits` maps
+    "api"/"downloads" to semaphores bounding the API stages and each scene's
+    footage download; both are used by `create_content_batch` to share resources
+    between concurrent jobs.
     """
     logger.info(
         f"Starting content creation for: {topic} (Lang: {language}, Quality: {quality}, Voice: {voice})"
     )
 
     # Paths
-    base_dir = f"data/output/{channel_name}/{int(time.time())}"
-    os.makedirs(base_dir, exist_ok=True)
+    channel_dir = f"data/output/{channel_name}"
+    base_dir = None
+    if resume:
+        base_dir = find_latest_job(channel_dir, topic=topic, language=language)
+        if base_dir:
+            logger.info(f"Resuming job in {base_dir}")
+    base_dir = base_dir or _new_job_dir(channel_dir)
+    manifest = JobManifest(base_dir, job={"topic": topic, "language": language})
+    manifest.mark_completed(False)
 
     audio_path = os.path.join(base_dir, "voiceover.mp3")
     video_output = os.path.join(base_dir, "final.mp4")
 
-    # 1. Script
-    logger.info("Step 1: generating Script")
-    script_data = script_generator.generate_script(topic, language=language)
-    if not script_data:
-        logger.error("Failed to generate script.")
-        return None
+    # Footage downloads started while the script is still streaming, by scene
+    prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="prefetch")
+    prefetched = {}
+    used_visual_urls = set()
+    used_visual_urls_lock = threading.Lock()
+    # Held per scene download, never by a stage waiting on downloads
+    downloads = (limits or {}).get("downloads")
+
+    def prefetch_scene(i, scene):
+        def fetch():
+            return _fetch_scene_visual(
+                i, scene, topic, base_dir, used_visual_urls, used_visual_urls_lock
+            )
 
-    script_text = script_data.get("script", "")
-    logger.info(f"Script length: {len(script_text)} chars")
+        prefetched[i] = prefetch_pool.submit(
+            _limited(fetch, downloads) if downloads else fetch
+        )
 
-    # 2. Audio
-    logger.info("Step 2: Generating Audio")
-    if not tts.generate_voiceover(script_text, audio_path, lang=language, voice=voice):
-        logger.error("Failed to generate voiceover.")
-        return None
+    def script_stage():
+        logger.info("Step 1: generating Script")
+        prefetched.clear()
+        if Config.SCRIPT_STREAMING:
+            script_data = script_generator.generate_script_stream(
+                topic, language=language, on_scene=prefetch_scene
+            )
+        else:
+            script_data = script_generator.generate_script(topic, language=language)
+        if not script_data:
+            raise StageFailed("Failed to generate script.")
+        logger.info(f"Script length: {len(script_data.get('script', ''))} chars")
+        return script_data
 
-    # 3. Subtitles
-    logger.info("Step 3: Generating Subtitles")
-    subs = subtitles.generate_subtitles_v2(audio_path, language=language)
+    def audio_stage(script):
+        logger.info("Step 2: Generating Audio")
+        if not tts.generate_voiceover(
+            script.get("script", ""), audio_path, lang=language, voice=voice
+        ):
+            raise StageFailed("Failed to generate voiceover.")
+        return audio_path
 
-    # 4. Visuals
-    logger.info("Step 4: Fetching Visuals")
-    visual_paths = []
-    used_visual_urls = set()
-    scenes = script_data.get("scenes", [])
+    def subtitles_stage(audio):
+        logger.info("Step 3: Generating Subtitles")
+        return subtitles.generate_word_timings(audio, language=language)
 
-    # Track downloaded clips to ensure we don't repeat the same clip too often
-    for i, scene in enumerate(scenes):
-        scene_keywords = scene.get("keywords", [])
-        if not scene_keywords:
-            scene_keywords = [topic]
-
-        # Fetch up to 2 unique visuals per scene to ensure variety
-        for k in range(min(len(scene_keywords), 2)):
-            query = scene_keywords[k]
-            v_path = os.path.join(base_dir, f"scene_{i}_v{k}.mp4")
-
-            downloaded, video_url = visuals.get_stock_footage(
-                query, v_path, used_urls=used_visual_urls
+    def visuals_stage(script):
+        logger.info("Step 4: Fetching Visuals")
+        if prefetched:
+            logger.info(
+                f"Collecting {len(prefetched)} visuals prefetched while streaming"
             )
-            if downloaded:
-                visual_paths.append(downloaded)
-                used_visual_urls.add(video_url)
-                logger.info(f"Downloaded unique visual for: {query}")
-                # We stop at 1 if it's broad enough, but for complex topics we take 2
-                if k >= 0:  # Change to 1 if you want exactly 2 per scene
-                    break
-            else:
-                logger.warning(f"Could not download visual for {query}")
+        visual_paths = []
+        for i, scene in enumerate(script.get("scenes", [])):
+            if i in prefetched:
+                visual_paths.append(prefetched[i].result())
+                continue
+            # Not prefetched: the script came from the manifest, did not stream,
+            # or the scene could not be parsed mid-stream
+            with downloads or contextlib.nullcontext():
+                visual_paths.append(
+                    _fetch_scene_visual(
+                        i,
+                        scene,
+                        topic,
+                        base_dir,
+                        used_visual_urls,
+                        used_visual_urls_lock,
+                    )
+                )
+        visual_paths = [path for path in visual_paths if path]
+        if not visual_paths:
+            logger.error("No visuals downloaded.")
+        return visual_paths
 
-    if not visual_paths:
-        logger.error("No visuals downloaded.")
+    def render_stage(audio, subtitles, visuals):
+        logger.info("Step 5: Assembling Video")
+        job = {
+            "audio": audio,
+            "visuals": visuals,
+            "subtitles": subtitles,
+            "output_path": video_output,
+            "quality": quality,
+            "backend": backend,
+            "subtitle_mode": subtitle_mode,
+        }
+        if render_pool:
+            return render_pool.submit(_render, job).result()
+        return _render(job)
 
-    # 5. Assemble
-    logger.info("Step 5: Assembling Video")
-    renderer = VideoRenderer()
-    renderer.assemble_short(
-        audio_path,
-        visual_paths,
-        subtitles=subs,
-        output_path=video_output,
-        quality=quality,
+    def stage(name, fn, params=None, artifacts=None, limit=None):
+        semaphore = (limits or {}).get(limit)
+        if semaphore:
+            fn = _limited(fn, semaphore)
+        return manifest.checkpoint(name, fn, params, artifacts, resume=resume)
+
+    dag = StageDAG(name=f"create_content:{channel_name}")
+    dag.add(
+        "script",
+        stage(
+            "script",
+            script_stage,
+            {"topic": topic, "language": language},
+            limit="api",
+        ),
+    )
+    dag.add(
+        "audio",
+        stage(
+            "audio",
+            audio_stage,
+            {"voice": voice, "language": language},
+            lambda path: [path, tts.words_path_for(path)],
+            limit="api",
+        ),
+        deps=["script"],
+    )
+    dag.add(
+        "subtitles",
+        stage("subtitles", subtitles_stage, {"language": language}, limit="api"),
+        deps=["audio"],
+    )
+    dag.add(
+        "visuals",
+        stage(
+            "visuals",
+            visuals_stage,
+            artifacts=lambda paths: paths,
+        ),
+        deps=["script"],
     )
+    dag.add(
+        "render",
+        stage(
+            "render",
+            render_stage,
+            {"quality": quality, "backend": backend, "subtitle_mode": subtitle_mode},
+            lambda path: [path],
+        ),
+        deps=["audio", "subtitles", "visuals"],
+    )
+
+    try:
+        dag.run()
+    except StageFailed as e:
+        logger.error(str(e))
+        return None
+    finally:
+        prefetch_pool.shutdown(cancel_futures=True)
+    manifest.mark_completed()
 
     logger.info(f"Video created successfully: {video_output}")
     return video_output
 
 
+def create_variants(
+    topic,
+    channel_name="TestChannel",
+    languages=("ru", "en"),
+    quality="easy",
+    voices=None,
+    backend=None,
+    subtitle_mode=None,
+    resume=False,
+):
+    """
+    Produces the same topic in several languages from one visual track.
+
+    Every language gets its own script, voiceover and subtitles, but stock footage
+    is fetched once (from the first language's scene keywords) and the B-roll is
+    rendered once, as long as the longest voiceover and without audio or
+    subtitles. Each variant then only burns in its subtitles and muxes its
+    voiceover over that track (see `VideoRenderer.assemble_variant`), so an extra
+    language costs a fraction of a full render.
+
+    `voices` maps a language to its TTS voice. Returns {language: video_path},
+    or None if a stage failed. Stages are recorded and resumed like in
+    `create_content`.
+    """
+    languages = list(dict.fromkeys(languages))
+    voices = voices or {}
+    logger.info(f"Starting variants for: {topic} (Langs: {languages})")
+
+    channel_dir = f"data/output/{channel_name}"
+    base_dir = None
+    if resume:
+        base_dir = find_latest_job(channel_dir, topic=topic, languages=languages)
+        if base_dir:
+            logger.info(f"Resuming job in {base_dir}")
+    base_dir = base_dir or _new_job_dir(channel_dir)
+    manifest = JobManifest(base_dir, job={"topic": topic, "languages": languages})
+    manifest.mark_completed(False)
+    renderer = VideoRenderer.from_quality(quality)
+    track_path = os.path.join(base_dir, "visual_track.mp4")
+
+    def script_stage(language):
+        def run():
+            script_data = script_generator.generate_script(topic, language=language)
+            if not script_data:
+                raise StageFailed(f"Failed to generate {language} script.")
+            return script_data
+
+        return run
+
+    def audio_stage(language):
+        audio_path = os.path.join(base_dir, f"voiceover_{language}.mp3")
+
+        def run(**deps):
+            script = deps[f"script_{language}"]
+            if not tts.generate_voiceover(
+                script.get("script", ""),
+                audio_path,
+                lang=language,
+                voice=voices.get(language),
+            ):
+                raise StageFailed(f"Failed to generate {language} voiceover.")
+            return audio_path
+
+        return run
+
+    def subtitles_stage(language):
+        def run(**deps):
+            return subtitles.generate_word_timings(
+                deps[f"audio_{language}"], language=language
+            )
+
+        return run
+
+    def visuals_stage(**deps):
+        return _fetch_visuals(deps[f"script_{languages[0]}"], topic, base_dir)
+
+    def track_stage(visuals, **deps):
+        duration = max(
+            probe_media(deps[f"audio_{language}"])["duration"] for language in languages
+        )
+        return renderer.render_visual_track(visuals, duration, track_path, quality)
+
+    def render_stage(language):
+        def run(track, **deps):
+            return renderer.assemble_variant(
+                track,
+                deps[f"audio_{language}"],
+                subtitles=deps[f"subtitles_{language}"],
+                output_path=os.path.join(base_dir, f"final_{language}.mp4"),
+                quality=quality,
+                backend=backend or "ffmpeg",
+                subtitle_mode=subtitle_mode,
+            )
+
+        return run
+
+    def stage(name, fn, params=None, artifacts=None):
+        return manifest.checkpoint(name, fn, params, artifacts, resume=resume)
+
+    dag = StageDAG(name=f"create_variants:{channel_name}")
+    for language in languages:
+        dag.add(
+            f"script_{language}",
+            stage(
+                f"script_{language}",
+                script_stage(language),
+                {"topic": topic, "language": language},
+            ),
+        )
+        dag.add(
+            f"audio_{language}",
+            stage(
+                f"audio_{language}",
+                audio_stage(language),
+                {"voice": voices.get(language), "language": language},
+                lambda path: [path, tts.words_path_for(path)],
+            ),
+            deps=[f"script_{language}"],
+        )
+        dag.add(
+            f"subtitles_{language}",
+            stage(f"subtitles_{language}", subtitles_stage(language)),
+            deps=[f"audio_{language}"],
+        )
+    dag.add(
+        "visuals",
+        stage("visuals", visuals_stage, artifacts=lambda paths: paths),
+        deps=[f"script_{languages[0]}"],
+    )
+    dag.add(
+        "track",
+        stage("track", track_stage, {"quality": quality}, lambda path: [path]),
+        deps=["visuals"] + [f"audio_{language}" for language in languages],
+    )
+    for language in languages:
+        dag.add(
+            f"render_{language}",
+            stage(
+                f"render_{language}",
+                render_stage(language),
+                {
+                    "quality": quality,
+                    "backend": backend,
+                    "subtitle_mode": subtitle_mode,
+                },
+                lambda path: [path],
+            ),
+            deps=["track", f"audio_{language}", f"subtitles_{language}"],
+        )
+
+    try:
+        results = dag.run()
+    except StageFailed as e:
+        logger.error(str(e))
+        return None
+    manifest.mark_completed()
+
+    videos = {language: results[f"render_{language}"] for language in languages}
+    logger.info(f"Variants created successfully: {videos}")
+    return videos
+
+
+def create_content_batch(
+    topics,
+    channel_name="TestChannel",
+    language="ru",
+    quality="easy",
+    voice=None,
+    backend=None,
+    subtitle_mode=None,
+    resume=False,
+    api_concurrency=None,
+    download_concurrency=None,
+    render_workers=None,
+):
+    """
+    Produces videos for many topics at once and yields (topic, video_path) pairs
+    as they finish (video_path is None for a failed topic).
+
+    Topics are pipelined through shared, bounded resources: at most
+    `api_concurrency` script/TTS/transcription calls and `download_concurrency`
+    stock footage fetches at a time (over the shared HTTP session), and renders
+    in a pool of `render_workers` spawned processes, each given an equal share
+    of the cores as its encoder threads. Defaults come from the BATCH_* config.
+    Scripts are first requested several topics at a time (see
+    `script_generator.generate_scripts_batch`).
+    """
+    topics = list(topics)
+    api_concurrency = api_concurrency or Config.BATCH_API_CONCURRENCY
+    download_concurrency = download_concurrency or Config.BATCH_DOWNLOAD_CONCURRENCY
+    render_workers = (
+        render_workers
+        or Config.BATCH_RENDER_WORKERS
+        or get_render_governor().max_concurrent
+    )
+    limits = {
+        "api": threading.BoundedSemaphore(api_concurrency),
+        "downloads": threading.BoundedSemaphore(download_concurrency),
+    }
+    # Each render worker owns an equal share of the cores, whatever its own
+    # governor would pick, so the workers together do not oversubscribe them
+    render_threads = max(1, (os.cpu_count() or 1) // render_workers)
+    # Enough jobs in flight to keep every API slot and render worker busy
+    in_flight = min(len(topics), api_concurrency + render_workers) or 1
+    logger.info(
+        f"Batch of {len(topics)} topics for {channel_name}: {in_flight} in flight, "
+        f"{api_concurrency} API / {download_concurrency} download slots, "
+        f"{render_workers} render workers x {render_threads} threads"
+    )
+
+    if Config.SCRIPT_CACHE and len(topics) > 1:
+        # Batched requests fill the script cache, so the jobs start from cached
+        # scripts; topics the batch could not produce are generated by their job
+        script_generator.generate_scripts_batch(topics, language, fallback=False)
+
+    started = time.time()
+    done = 0
+    with contextlib.ExitStack() as stack:
+        render_pool = stack.enter_context(
+            ProcessPoolExecutor(
+                max_workers=render_workers,
+                # The parent runs job threads (and HTTP sessions); forking them
+                # mid-flight can deadlock the child on a lock held at fork time
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_render_worker,
+                initargs=(render_threads,),
+            )
+        )
+        job_pool = stack.enter_context(
+            ThreadPoolExecutor(max_workers=in_flight, thread_name_prefix="batch")
+        )
+        futures = {
+            job_pool.submit(
+                create_content,
+                topic,
+                channel_name=channel_name,
+                language=language,
+                quality=quality,
+                voice=voice,
+                backend=backend,
+                subtitle_mode=subtitle_mode,
+                resume=resume,
+                render_pool=render_pool,
+                limits=limits,
+            ): topic
+            for topic in topics
+        }
+        try:
+            for future in as_completed(futures):
+                topic = futures[future]
+                try:
+                    video_path = future.result()
+                except Exception as e:
+                    logger.error(f"Batch job failed for '{topic}': {e}")
+                    video_path = None
+                done += 1
+                logger.info(
+                    f"Batch progress: {done}/{len(topics)} "
+                    f"({time.time() - started:.0f}s elapsed)"
+                )
+                yield topic, video_path
+        finally:
+            # If the caller stops early, do not start the remaining topics
+            for future in futures:
+                future.cancel()
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -118,9 +604,74 @@ if __name__ == "__main__":
         choices=["en", "ru"],
         help="Language for content",
     )
-    parser.add_argument("--quality", type=str, default="easy", help="Rendering quality")
+    parser.add_argument(
+        "--quality",
+        type=str,
+        default="easy",
+        help="Encoding profile (preview, easy, hard, upload)",
+    )
     parser.add_argument("--voice", type=str, default=None, help="TTS voice name")
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default=None,
+        choices=["moviepy", "ffmpeg"],
+        help="Render backend (defaults to RENDER_BACKEND)",
+    )
+    parser.add_argument(
+        "--subtitle-mode",
+        type=str,
+        default=None,
+        choices=["sprites", "ass"],
+        help="Subtitle rendering (defaults to SUBTITLE_MODE)",
+    )
+
+    parser.add_argument(
+        "--topics-file",
+        type=str,
+        default=None,
+        help="File with one topic per line, produced as a batch (overrides --topic)",
+    )
+
+    parser.add_argument(
+        "--langs",
+        type=str,
+        default=None,
+        help="Comma-separated languages (e.g. ru,en) rendered as variants of one "
+        "visual track (overrides --lang)",
+    )
 
     args = parser.parse_args()
 
-    create_content(args.topic, args.channel, args.lang, args.quality, args.voice)
+    if args.langs:
+        create_variants(
+            args.topic,
+            args.channel,
+            [lang.strip() for lang in args.langs.split(",") if lang.strip()],
+            args.quality,
+            backend=args.backend,
+            subtitle_mode=args.subtitle_mode,
+        )
+    elif args.topics_file:
+        with open(args.topics_file, "r", encoding="utf-8") as f:
+            topics = [line.strip() for line in f if line.strip()]
+        for topic, path in create_content_batch(
+            topics,
+            args.channel,
+            args.lang,
+            args.quality,
+            args.voice,
+            args.backend,
+            args.subtitle_mode,
+        ):
+            print(f"{topic}: {path or 'FAILED'}")
+    else:
+        create_content(
+            args.topic,
+            args.channel,
+            args.lang,
+            args.quality,
+            args.voice,
+            args.backend,
+            args.subtitle_mode,
+        )
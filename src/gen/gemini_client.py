@@ -0,0 +1,241 @@
+import asyncio
+import collections
+import logging
+import random
+import statistics
+import threading
+import time
+
+from google.api_core import exceptions as api_exceptions
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Errors worth another attempt: quota/rate limits, overload and timeouts
+TRANSIENT_ERRORS = (
+    api_exceptions.TooManyRequests,
+    api_exceptions.ResourceExhausted,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.InternalServerError,
+    api_exceptions.DeadlineExceeded,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+
+# Latencies kept per client for the percentiles in `stats`
+LATENCY_WINDOW = 500
+
+
+class RateLimiter:
+    """
+    Spaces call starts at least 60 / `per_minute` seconds apart (0 = unlimited).
+    Used on the client loop only (see `run_sync`).
+    """
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncGeminiClient:
+    """
+    Async wrapper around a `genai.GenerativeModel` for running many generations
+    concurrently: at most `max_concurrency` requests in flight, starts spaced by
+    a requests-per-minute limit, transient errors retried with exponential
+    backoff and full jitter. Latency of every attempt is recorded.
+
+    Requests always run on the process-wide client loop, whichever loop or
+    thread makes them, so the limits hold across all callers and the asyncio
+    primitives (and the model's async channel) stay bound to one loop.
+    """
+
+    def __init__(
+        self,
+        model,
+        name="gemini",
+        max_concurrency=None,
+        requests_per_minute=None,
+        max_retries=None,
+        backoff_base=None,
+        backoff_max=None,
+    ):
+        self.model = model
+        self.name = name
+        self.max_retries = (
+            Config.GEMINI_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.backoff_base = backoff_base or Config.GEMINI_BACKOFF_BASE
+        self.backoff_max = backoff_max or Config.GEMINI_BACKOFF_MAX
+        self._semaphore = asyncio.Semaphore(
+            max_concurrency or Config.GEMINI_MAX_CONCURRENCY
+        )
+        self._rate = RateLimiter(
+            Config.GEMINI_REQUESTS_PER_MINUTE
+            if requests_per_minute is None
+            else requests_per_minute
+        )
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    def backoff(self, attempt):
+        """Delay before retry number `attempt` (1-based): full jitter, capped."""
+        cap = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    async def _request(self, *args, **kwargs):
+        attempt = 0
+        while True:
+            await self._rate.wait()
+            started = time.monotonic()
+            try:
+                response = await self.model.generate_content_async(*args, **kwargs)
+                self.latencies.append(time.monotonic() - started)
+                self.calls += 1
+                return response
+            except TRANSIENT_ERRORS as e:
+                self.latencies.append(time.monotonic() - started)
+                attempt += 1
+                if attempt > self.max_retries:
+                    self.failures += 1
+                    logger.error(
+                        f"[{self.name}] Giving up after {attempt} attempts: {e}"
+                    )
+                    raise
+                self.retries += 1
+                delay = self.backoff(attempt)
+                logger.warning(
+                    f"[{self.name}] Transient error ({type(e).__name__}), "
+                    f"retry {attempt}/{self.max_retries} in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+            except Exception:
+                self.failures += 1
+                raise
+
+    async def _generate(self, *args, **kwargs):
+        async with self._semaphore:
+            return await self._request(*args, **kwargs)
+
+    async def _stream(self, on_text, *args, **kwargs):
+        async with self._semaphore:
+            response = await self._request(*args, stream=True, **kwargs)
+            async for chunk in response:
+                on_text(chunk.text)
+        return response
+
+    async def generate(self, *args, **kwargs):
+        """`generate_content_async` with the client's limits and retries."""
+        return await _on_client_loop(self._generate(*args, **kwargs))
+
+    async def stream(self, on_text, *args, **kwargs):
+        """
+        Streamed `generate`: `on_text(text)` is called with each chunk as it
+        arrives (on the client loop) and the request keeps its slot until the
+        stream ends. Only starting the request is retried. Returns the response.
+        """
+        return await _on_client_loop(self._stream(on_text, *args, **kwargs))
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        stats = {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "mean": None,
+            "p50": None,
+            "p95": None,
+        }
+        if latencies:
+            stats["mean"] = round(statistics.fmean(latencies), 3)
+            stats["p50"] = round(latencies[len(latencies) // 2], 3)
+            stats["p95"] = round(latencies[int(len(latencies) * 0.95)], 3)
+        return stats
+
+    def log_summary(self):
+        stats = self.stats()
+        logger.info(
+            f"[{self.name}] {stats['calls']} calls, {stats['retries']} retries, "
+            f"{stats['failures']} failures, latency mean {stats['mean']}s "
+            f"p50 {stats['p50']}s p95 {stats['p95']}s"
+        )
+        return stats
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_client_loop():
+    """The process-wide event loop, run by a daemon thread, for Gemini requests."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="gemini-client", daemon=True
+            ).start()
+        return _loop
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def _on_client_loop(coro):
+    """Awaits `coro` on the client loop, from that loop or any other one."""
+    loop = get_client_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def run_sync(coro):
+    """
+    Runs `coro` on the client loop and blocks until it returns; the entry point
+    for synchronous callers (pipeline stages, worker threads).
+    """
+    loop = get_client_loop()
+    if _running_loop() is loop:
+        coro.close()
+        raise RuntimeError("run_sync would block the Gemini client loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_async_client(name, model_factory):
+    """
+    Returns the process-wide AsyncGeminiClient called `name`, wrapping the model
+    returned by `model_factory` (e.g. `script_generator.get_client`).
+    """
+    with _clients_lock:
+        if name not in _clients:
+            _clients[name] = AsyncGeminiClient(model_factory(), name=name)
+        return _clients[name]
+
+
+def log_summaries():
+    """Logs the stats of every client created so far (e.g. once per cycle)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+    for client in clients:
+        client.log_summary()
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from src.config import Config
+from src.utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+
+class ScriptCache:
+    """
+    Generated scripts stored as JSON under a key of everything that shapes the
+    Gemini response (topic, language, model, prompt version), so retries, test
+    renders and repeated topics reuse the script instead of calling the API.
+
+    Entries older than `ttl` seconds are regenerated; the directory is capped at
+    `max_bytes` with the same LRU eviction as the other disk caches.
+    """
+
+    def __init__(self, root, max_bytes, ttl):
+        self.cache = DiskCache(root, max_bytes, name="scripts")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._reset_window()
+
+    def _reset_window(self):
+        # Counters since the last `log_summary`, i.e. per automation cycle
+        self.window = {"hits": 0, "misses": 0, "saved_seconds": 0.0}
+
+    def _count(self, hit, seconds=0.0):
+        with self._lock:
+            self.window["hits" if hit else "misses"] += 1
+            self.window["saved_seconds"] += seconds
+
+    def key_for(self, topic, language, model_id, prompt_version):
+        payload = {
+            "topic": topic.strip().lower(),
+            "language": language,
+            "model": model_id,
+            "prompt_version": prompt_version,
+        }
+        blob = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Returns the cached script dict for `key`, or None if missing or expired."""
+        path = self.cache.get(key, ".json")
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                age = time.time() - entry["created_at"]
+                if age <= self.ttl:
+                    seconds = entry.get("generation_seconds", 0.0)
+                    self._count(True, seconds)
+                    logger.info(
+                        f"Script cache hit: {key[:12]} ({age / 3600:.1f}h old), "
+                        f"saved an API call and ~{seconds:.1f}s"
+                    )
+                    return entry["script"]
+                logger.info(f"Script cache entry {key[:12]} expired, regenerating")
+                os.remove(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable script cache entry {path}: {e}")
+        self._count(False)
+        logger.info(f"Script cache miss: {key[:12]}")
+        return None
+
+    def put(self, key, script, generation_seconds):
+        """Stores a freshly generated script."""
+        entry = {
+            "created_at": time.time(),
+            "generation_seconds": round(generation_seconds, 2),
+            "script": script,
+        }
+        try:
+            tmp = self.cache.tmp_path(key, ".json")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            self.cache.put(key, tmp, ".json")
+        except OSError as e:
+            logger.warning(f"Could not store script in cache: {e}")
+
+    def log_summary(self, reset=True):
+        """Logs hits/misses and saved latency since the last summary."""
+        with self._lock:
+            window = dict(self.window)
+            if reset:
+                self._reset_window()
+        if window["hits"] or window["misses"]:
+            logger.info(
+                f"Script cache: {window['hits']} hits / {window['misses']} misses, "
+                f"saved {window['hits']} API calls and "
+                f"~{window['saved_seconds']:.1f}s of generation"
+            )
+        return window
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_script_cache():
+    """Returns the process-wide ScriptCache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ScriptCache(
+                Config.SCRIPT_CACHE_DIR,
+                Config.SCRIPT_CACHE_MAX_MB * 1024 * 1024,
+                Config.SCRIPT_CACHE_TTL_HOURS * 3600,
+            )
+        return _cache
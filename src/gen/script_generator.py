@@ -1,18 +1,23 @@
 import json
 import logging
 import os
+import time
 
 # Reverting to google.generativeai to match the project's installed libraries
 # The deprecation warning is acceptable for now to ensure the code runs.
 import google.generativeai as genai
 
 from src.config import Config
+from src.gen.gemini_client import get_async_client, run_sync
+from src.gen.script_cache import get_script_cache
 
 # Global client and model ID
 _client = None
 logger = logging.getLogger(__name__)
 # Use the 'latest' version to avoid the 'not found' error
 GEMINI_MODEL_ID = Config.GEMINI_MODEL_ID
+# Bump when build_prompt changes, so cached scripts from the old prompt are not reused
+PROMPT_VERSION = 1
 
 
 def get_client():
@@ -47,23 +52,8 @@ You must always respond in the requested JSON format.
     return _client
 
 
-def generate_script(topic, language="ru"):
-    """
-    Generates a short video script using Google's Gemini 1.5 Flash.
-    The script is structured for high engagement on platforms like YouTube Shorts.
-    """
-    logger.info(f"Generating script for topic: '{topic}' in language: {language}")
-    try:
-        client = get_client()
-
-        prompt = f"""
-        **Objective:** Create a script for a YouTube Short (under 60 seconds) on the topic: "{topic}".
-
-        **Language for the spoken script:** {language}
-
-        **Output Format:** You MUST return a single, valid JSON object. Do not include markdown formatting like ```json.
-        The JSON object must have two keys: "script" and "scenes".
-
+# Output format and worked example, shared by the single and the batch prompt
+SCRIPT_SPEC = """
         **JSON Structure Details:**
 
         1.  **"script" (string):**
@@ -84,48 +74,362 @@ def generate_script(topic, language="ru"):
                     - **AVOID GENERIC TERMS:** Do not use vague words like "interesting", "background", "person".
 
         **Example for a video about "The Ocean's Strangest Creatures":**
-        {{
+        {
           "script": "Did you know the ocean's deepest parts are like another planet? Meet the Goblin Shark, a living fossil with a terrifying jaw. Then there's the Vampire Squid, which uses glowing arms to dazzle its prey. The ocean is full of wonders. Follow for more amazing facts!",
           "scenes": [
-            {{
+            {
               "text": "Did you know the ocean's deepest parts are like another planet?",
               "keywords": ["dark deep ocean trench", "sunlight filtering through water", "cinematic underwater shot"]
-            }},
-            {{
+            },
+            {
               "text": "Meet the Goblin Shark, a living fossil with a terrifying jaw.",
               "keywords": ["close up of goblin shark face", "goblin shark extending jaw", "scientific illustration of prehistoric shark"]
-            }},
-            {{
+            },
+            {
               "text": "The ocean is full of wonders. Follow for more amazing facts!",
               "keywords": ["beautiful coral reef time-lapse", "school of colorful fish swimming", "subscribe button animation"]
-            }}
+            }
           ]
-        }}
+        }
+"""
+
 
+def build_prompt(topic, language):
+    """The script request sent to Gemini for `topic` in `language`."""
+    return (
+        f"""
+        **Objective:** Create a script for a YouTube Short (under 60 seconds) on the topic: "{topic}".
+
+        **Language for the spoken script:** {language}
+
+        **Output Format:** You MUST return a single, valid JSON object. Do not include markdown formatting like ```json.
+        The JSON object must have two keys: "script" and "scenes".
+"""
+        + SCRIPT_SPEC
+        + f"""
         Now, generate the script for the topic: "{topic}".
         """
+    )
+
+
+def build_batch_prompt(topics, language):
+    """One request for a script per topic; the format spec and example are sent once."""
+    listing = "\n".join(f'        {i}. "{topic}"' for i, topic in enumerate(topics, 1))
+    return (
+        f"""
+        **Objective:** Create {len(topics)} scripts for YouTube Shorts (each under 60 seconds), one for each topic below.
+
+        **Topics:**
+{listing}
+
+        **Language for the spoken scripts:** {language}
+
+        **Output Format:** You MUST return a single, valid JSON object. Do not include markdown formatting like ```json.
+        The JSON object must have one key, "scripts": an array with one object per topic, in the order listed.
+        Each object must have three keys: "topic" (copied exactly from the list), "script" and "scenes".
+        Each script follows the structure below.
+"""
+        + SCRIPT_SPEC
+        + f"""
+        Now, generate the scripts for all {len(topics)} topics.
+        """
+    )
+
+
+def _cached_script(topic, language, force_refresh):
+    """Returns (cache_key, cached script or None); the key is None with the cache off."""
+    if not Config.SCRIPT_CACHE:
+        return None, None
+    cache = get_script_cache()
+    key = cache.key_for(topic, language, GEMINI_MODEL_ID, PROMPT_VERSION)
+    if force_refresh:
+        logger.info(f"Script cache bypassed for topic: '{topic}'")
+        return key, None
+    return key, cache.get(key)
+
+
+def _cache_script(key, data, seconds):
+    if key and data:
+        get_script_cache().put(key, data, seconds)
+
+
+class SceneStreamParser:
+    """
+    Pulls complete scene objects out of a script JSON response while it is still
+    being streamed. Feed it the text chunks in order; each `feed` returns
+    (index, scene) pairs for the scenes of the top-level "scenes" array that were
+    completed by that chunk. The index is the scene's position in the array, so
+    a scene that fails to parse does not shift the ones after it.
+    Only brackets outside of strings are tracked, so the text is scanned once.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.string_start = None
+        self.last_string = None
+        self.in_scenes = False
+        self.scene_start = None
+        self.scene_index = 0
+
+    def feed(self, chunk):
+        self.text += chunk
+        scenes = []
+        text = self.text
+        for i in range(self.pos, len(text)):
+            char = text[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    self.last_string = text[self.string_start + 1 : i]
+                continue
+
+            if char == '"':
+                self.in_string = True
+                self.string_start = i
+            elif char in "[{":
+                # The array that follows the "scenes" key of the top-level object
+                if char == "[" and self.depth == 1 and self.last_string == "scenes":
+                    self.in_scenes = True
+                elif char == "{" and self.in_scenes and self.depth == 2:
+                    self.scene_start = i
+                self.depth += 1
+            elif char in "]}":
+                self.depth -= 1
+                if self.in_scenes and self.depth == 2 and self.scene_start is not None:
+                    try:
+                        scene = json.loads(text[self.scene_start : i + 1])
+                        scenes.append((self.scene_index, scene))
+                    except ValueError as e:
+                        logger.warning(
+                            f"Skipping unparsable streamed scene {self.scene_index}: {e}"
+                        )
+                    self.scene_index += 1
+                    self.scene_start = None
+                elif self.in_scenes and self.depth == 1:
+                    self.in_scenes = False
+        self.pos = len(text)
+        return scenes
+
+
+def generate_script_stream(topic, language="ru", on_scene=None, force_refresh=False):
+    """
+    Same as `generate_script`, but the response is streamed and `on_scene(index,
+    scene)` is called as soon as each scene object is complete, so work that only
+    needs a scene's keywords (stock footage search) can start while Gemini is
+    still writing the rest of the script. Returns the full script dict, or None.
+    A cached script replays its scenes through `on_scene` right away.
+    """
+    logger.info(f"Streaming script for topic: '{topic}' in language: {language}")
+    key, cached = _cached_script(topic, language, force_refresh)
+    if cached:
+        if on_scene:
+            for i, scene in enumerate(cached.get("scenes", [])):
+                on_scene(i, scene)
+        return cached
+
+    return run_sync(_stream_script(topic, language, on_scene, key))
+
 
-        response = client.generate_content(
-            prompt,
+async def _stream_script(topic, language, on_scene, key):
+    chunks = []
+    started = time.time()
+    parser = SceneStreamParser()
+    count = 0
+
+    def on_text(text):
+        nonlocal count
+        chunks.append(text)
+        for index, scene in parser.feed(text):
+            if count == 0:
+                logger.info(f"First scene after {time.time() - started:.1f}s")
+            if on_scene:
+                try:
+                    on_scene(index, scene)
+                except Exception as e:
+                    logger.error(f"Scene callback failed for scene {index}: {e}")
+            count += 1
+
+    try:
+        client = get_async_client("script", get_client)
+        await client.stream(
+            on_text,
+            build_prompt(topic, language),
             generation_config=genai.types.GenerationConfig(
                 response_mime_type="application/json"
             ),
         )
+        data = json.loads("".join(chunks))
+        logger.info(
+            f"Successfully generated script for topic: {topic} "
+            f"({count} scenes streamed in {time.time() - started:.1f}s)"
+        )
+        _cache_script(key, data, time.time() - started)
+        return data
+
+    except Exception as e:
+        logger.error(f"Error streaming script with Gemini: {e}")
+        if chunks:
+            logger.error(f"Gemini response text: {''.join(chunks)}")
+        return None
+
+
+def generate_script(topic, language="ru", force_refresh=False):
+    """
+    Generates a short video script using Google's Gemini 1.5 Flash.
+    The script is structured for high engagement on platforms like YouTube Shorts.
+
+    Scripts are cached on disk by topic, language, model and prompt version (see
+    script_cache.py); `force_refresh` skips the cached one and regenerates it.
+    """
+    logger.info(f"Generating script for topic: '{topic}' in language: {language}")
+    key, cached = _cached_script(topic, language, force_refresh)
+    if cached:
+        return cached
+    return run_sync(_request_script(topic, language, key))
 
-        # The response should be valid JSON directly
-        data = json.loads(response.text)
 
+async def generate_script_async(topic, language="ru", force_refresh=False):
+    """
+    `generate_script` for an event loop, so many topics can be generated
+    concurrently within the shared Gemini client's limits.
+    """
+    logger.info(f"Generating script (async) for topic: '{topic}' in {language}")
+    key, cached = _cached_script(topic, language, force_refresh)
+    if cached:
+        return cached
+    return await _request_script(topic, language, key)
+
+
+async def _request_script(topic, language, key):
+    """
+    The script request, through the shared async Gemini client (concurrency and
+    rate limits, transient errors retried); returns the script dict or None.
+    """
+    text = None
+    try:
+        client = get_async_client("script", get_client)
+        started = time.time()
+        response = await client.generate(
+            build_prompt(topic, language),
+            generation_config=genai.types.GenerationConfig(
+                response_mime_type="application/json"
+            ),
+        )
+        text = response.text
+        # The response should be valid JSON directly
+        data = json.loads(text)
         logger.info(f"Successfully generated script for topic: {topic}")
+        _cache_script(key, data, time.time() - started)
         return data
 
     except Exception as e:
         logger.error(f"Error generating script with Gemini: {e}")
-        # Log the response text if available to debug invalid JSON
-        if "response" in locals() and hasattr(response, "text"):
-            logger.error(f"Gemini response text: {response.text}")
+        if text:
+            logger.error(f"Gemini response text: {text}")
         return None
 
 
+def is_valid_script(data):
+    """True if `data` has a non-empty script and scenes that each carry keywords."""
+    if not isinstance(data, dict):
+        return False
+    script, scenes = data.get("script"), data.get("scenes")
+    if not isinstance(script, str) or not script.strip():
+        return False
+    if not isinstance(scenes, list) or not scenes:
+        return False
+    return all(
+        isinstance(scene, dict) and isinstance(scene.get("keywords"), list)
+        for scene in scenes
+    )
+
+
+def _request_batch(topics, language):
+    """One Gemini call for `topics`; returns the valid scripts by topic."""
+    prompt = build_batch_prompt(topics, language)
+    single = sum(len(build_prompt(topic, language)) for topic in topics)
+    logger.info(
+        f"Requesting {len(topics)} scripts in one call "
+        f"(prompt {len(prompt)} chars vs {single} as separate calls)"
+    )
+    try:
+        client = get_async_client("script", get_client)
+        response = run_sync(
+            client.generate(
+                prompt,
+                generation_config=genai.types.GenerationConfig(
+                    response_mime_type="application/json"
+                ),
+            )
+        )
+        entries = json.loads(response.text).get("scripts", [])
+    except Exception as e:
+        logger.error(f"Error generating script batch with Gemini: {e}")
+        return {}
+
+    scripts = {}
+    for position, entry in enumerate(entries):
+        if not is_valid_script(entry):
+            continue
+        topic = entry.get("topic")
+        # The model may reword a topic; a complete, ordered answer still lines up
+        if topic not in topics and len(entries) == len(topics):
+            topic = topics[position]
+        if topic in topics and topic not in scripts:
+            scripts[topic] = {"script": entry["script"], "scenes": entry["scenes"]}
+    return scripts
+
+
+def generate_scripts_batch(
+    topics, language="ru", force_refresh=False, batch_size=None, fallback=True
+):
+    """
+    Generates scripts for several topics with one Gemini request per
+    `batch_size` topics (default SCRIPT_BATCH_SIZE), so the long format spec and
+    example are sent once per batch instead of once per topic.
+
+    Cached scripts are reused as in `generate_script`. Any topic whose entry is
+    missing or fails validation falls back to its own `generate_script` call
+    (with `fallback` off it is left as None for the caller to generate).
+    Returns {topic: script dict or None}, in the order of `topics`.
+    """
+    topics = list(dict.fromkeys(topics))
+    batch_size = max(1, batch_size or Config.SCRIPT_BATCH_SIZE)
+    results = {}
+    keys = {}
+    pending = []
+    for topic in topics:
+        keys[topic], results[topic] = _cached_script(topic, language, force_refresh)
+        if results[topic] is None:
+            pending.append(topic)
+
+    for i in range(0, len(pending), batch_size):
+        chunk = pending[i : i + batch_size]
+        scripts = {}
+        if len(chunk) > 1:
+            started = time.time()
+            scripts = _request_batch(chunk, language)
+            seconds = (time.time() - started) / len(chunk)
+            logger.info(f"Script batch: {len(scripts)}/{len(chunk)} valid")
+        for topic in chunk:
+            if topic in scripts:
+                results[topic] = scripts[topic]
+                _cache_script(keys[topic], scripts[topic], seconds)
+            elif fallback:
+                logger.warning(f"No batched script for '{topic}', generating alone")
+                # The cache was checked above, so only regenerate
+                results[topic] = generate_script(topic, language, force_refresh=True)
+    return {topic: results[topic] for topic in topics}
+
+
 if __name__ == "__main__":
     from dotenv import load_dotenv
 
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import os
@@ -6,6 +7,9 @@ import assemblyai
 import google.generativeai as genai
 
 from src.config import Config
+from src.gen import tts
+from src.gen.gemini_client import get_async_client, run_sync
+from src.gen.whisper_worker import get_whisper_worker
 
 logger = logging.getLogger(__name__)
 
@@ -39,44 +43,53 @@ def get_gemini_client():
     return _gemini_client
 
 
+TRANSCRIBE_PROMPT = """
+        Analyze the provided audio and transcribe it.
+        For each word, provide the start and end time in seconds.
+        Return the result STRICTLY as a JSON array of objects.
+        Each object should have keys: "word", "start", "end".
+        Example: [{"word": "Hello", "start": 0.1, "end": 0.5}]
+        """
+
+
+def _parse_words(response):
+    content = response.text
+    if not content:
+        logger.error("Empty response from Gemini.")
+        return []
+    words = json.loads(content)
+    logger.info(f"Transcription complete. Found {len(words)} words.")
+    return words
+
+
 def generate_subtitles(audio_path):
     """
     Transcribes audio using Gemini 1.5 Flash to get word-level timestamps.
     Returns a list of word objects: [{'word': str, 'start': float, 'end': float}]
     """
+    return run_sync(generate_subtitles_async(audio_path))
+
+
+async def generate_subtitles_async(audio_path):
+    """
+    `generate_subtitles` for an event loop: the transcription request goes
+    through the shared async Gemini client (concurrency limit, rate limit,
+    retries); the file upload and cleanup run in a worker thread.
+    """
     logger.info(f"Transcribing audio with Gemini: {audio_path}...")
     audio_file = None
     try:
-        client = get_gemini_client()
-        # 1. Upload the file
+        client = get_async_client("subtitles", get_gemini_client)
         logger.info(f"Uploading file to Gemini: {audio_path}")
-        audio_file = genai.upload_file(path=audio_path)
+        audio_file = await asyncio.to_thread(genai.upload_file, path=audio_path)
         logger.info(f"Uploaded file: {audio_file.name}")
-
-        # 2. Transcribe with prompt
-        prompt = """
-        Analyze the provided audio and transcribe it.
-        For each word, provide the start and end time in seconds.
-        Return the result STRICTLY as a JSON array of objects.
-        Each object should have keys: "word", "start", "end".
-        Example: [{"word": "Hello", "start": 0.1, "end": 0.5}]
-        """
-
-        response = client.generate_content(
-            contents=[prompt, audio_file],
+        response = await client.generate(
+            contents=[TRANSCRIBE_PROMPT, audio_file],
             generation_config=genai.types.GenerationConfig(
                 response_mime_type="application/json"
             ),
         )
-
-        content = response.text
-        if not content:
-            logger.error("Empty response from Gemini.")
-            return []
-
-        words = json.loads(content)
-        logger.info(f"Transcription complete. Found {len(words)} words.")
-        return words
+        return _parse_words(response)
 
     except Exception as e:
         logger.error(f"Error generating subtitles with Gemini: {e}")
@@ -85,7 +98,7 @@ def generate_subtitles(audio_path):
         if audio_file:
             try:
                 logger.info(f"Deleting uploaded file: {audio_file.name}")
-                genai.delete_file(audio_file.name)
+                await asyncio.to_thread(genai.delete_file, audio_file.name)
             except Exception as e:
                 logger.error(f"Failed to delete uploaded file {audio_file.name}: {e}")
 
@@ -152,6 +165,69 @@ def generate_subtitles_v2(audio_path, language="en"):
         return []
 
 
+# --- Local whisper (offline) ---
+def generate_subtitles_whisper(audio_path, language="en"):
+    """
+    Transcribes audio with the local whisper model kept loaded in a worker
+    process (see whisper_worker.py). Same word format, no network calls.
+    """
+    logger.info(f"Transcribing audio with local whisper in '{language}': {audio_path}")
+    try:
+        return get_whisper_worker().transcribe(audio_path, language=language)
+    except Exception as e:
+        logger.error(f"Error generating subtitles with whisper: {e}")
+        return []
+
+
+def _tts_word_timings(audio_path, language):
+    words = tts.load_word_timings(audio_path) or []
+    if words:
+        logger.info(f"Using {len(words)} word timings from TTS for {audio_path}")
+    return words
+
+
+PROVIDERS = {
+    "tts": _tts_word_timings,
+    "whisper": generate_subtitles_whisper,
+    "assemblyai": generate_subtitles_v2,
+    "gemini": lambda audio_path, language: generate_subtitles(audio_path),
+}
+
+
+def providers():
+    """The configured subtitle providers, in the order they are tried."""
+    names = [p.strip() for p in Config.SUBTITLES_PROVIDER.split(",") if p.strip()]
+    unknown = [name for name in names if name not in PROVIDERS]
+    if unknown:
+        logger.warning(f"Ignoring unknown subtitle providers: {unknown}")
+    return [name for name in names if name in PROVIDERS]
+
+
+def generate_word_timings(audio_path, language="en"):
+    """
+    Word-level subtitles for a voiceover from the first provider in
+    SUBTITLES_PROVIDER that returns any words. "tts" reads the word boundaries
+    edge-tts reported while synthesizing the audio (no transcription at all);
+    "whisper" runs locally, "assemblyai" and "gemini" upload the audio.
+    """
+    for name in providers():
+        words = PROVIDERS[name](audio_path, language)
+        if words:
+            return words
+        logger.info(f"Subtitle provider '{name}' returned no words, trying the next")
+    logger.error(f"No subtitle provider produced words for {audio_path}")
+    return []
+
+
+def warm_up():
+    """Loads the local whisper model up front if it is a configured provider."""
+    if "whisper" in providers():
+        try:
+            get_whisper_worker().start()
+        except Exception as e:
+            logger.error(f"Could not start the whisper worker: {e}")
+
+
 if __name__ == "__main__":
     from dotenv import load_dotenv
 
@@ -1,5 +1,7 @@
 import asyncio
+import json
 import logging
+import os
 from pathlib import Path
 
 import edge_tts
@@ -7,10 +9,43 @@ import nest_asyncio
 
 logger = logging.getLogger(__name__)
 
+# edge-tts reports offsets and durations in 100 ns units
+TICKS_PER_SECOND = 10_000_000
+
+
+def words_path_for(audio_path):
+    """Where the word timings of a voiceover are stored (next to the audio)."""
+    return os.path.splitext(str(audio_path))[0] + ".words.json"
+
+
+def load_word_timings(audio_path):
+    """Word timings saved with a voiceover, or None if there are none."""
+    path = words_path_for(audio_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f) or None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable word timings {path}: {e}")
+        return None
+
+
+def _communicate(text, voice):
+    try:
+        # Newer edge-tts versions emit sentence boundaries unless asked for words
+        return edge_tts.Communicate(text, voice, boundary="WordBoundary")
+    except TypeError:
+        return edge_tts.Communicate(text, voice)
+
 
 def generate_voiceover(text, output_path, lang="en", voice=None):
     """
     Generates an MP3 file from text using edge-tts.
+
+    The WordBoundary events edge-tts streams during synthesis are saved next to
+    the audio (see `load_word_timings`) as [{"word", "start", "end"}] in seconds,
+    the subtitle format, so the voiceover does not need to be transcribed.
     """
     if not voice:
         # Default voices if none provided
@@ -25,10 +60,20 @@ def generate_voiceover(text, output_path, lang="en", voice=None):
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
+        audio = bytearray()
+        words = []
 
         async def _generate():
-            communicate = edge_tts.Communicate(text, voice)
-            await communicate.save(str(output_path))
+            # Buffered in memory (a short is ~1 MB), written once the stream ends
+            audio.clear()
+            words.clear()
+            async for chunk in _communicate(text, voice).stream():
+                if chunk["type"] == "audio":
+                    audio.extend(chunk["data"])
+                elif chunk["type"] == "WordBoundary":
+                    start = chunk["offset"] / TICKS_PER_SECOND
+                    end = (chunk["offset"] + chunk["duration"]) / TICKS_PER_SECOND
+                    words.append({"word": chunk["text"], "start": start, "end": end})
 
         try:
             loop = asyncio.get_event_loop()
@@ -38,7 +83,16 @@ def generate_voiceover(text, output_path, lang="en", voice=None):
         except Exception:
             asyncio.run(_generate())
 
-        logger.info(f"Audio saved to {output_path}")
+        with open(output_path, "wb") as f:
+            f.write(audio)
+        logger.info(f"Audio saved to {output_path} ({len(words)} word timings)")
+        if text.strip() and not words:
+            logger.warning(
+                f"edge-tts sent no WordBoundary events for {output_path} ({voice}), "
+                "so the 'tts' subtitle provider has no word timings for it"
+            )
+        with open(words_path_for(output_path), "w", encoding="utf-8") as f:
+            json.dump(words, f, ensure_ascii=False)
         return output_path
 
     except Exception as e:
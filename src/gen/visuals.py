@@ -1,8 +1,10 @@
 import logging
 import random
+import threading
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.config import Config
 
@@ -11,6 +13,26 @@ logger = logging.getLogger(__name__)
 # Headers for Pexels API
 PEXELS_API_KEY = Config.PEXELS_API_KEY
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Shared HTTP session for Pexels searches and downloads. Connections are kept
+    alive and pooled (up to HTTP_POOL_SIZE per host) across calls and threads.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4, pool_maxsize=Config.HTTP_POOL_SIZE
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
 
 def search_pexels_videos(
     query, orientation="portrait", size="medium", duration_min=3, duration_max=15
@@ -33,7 +55,7 @@ def search_pexels_videos(
     }
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = get_session().get(url, headers=headers, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
 
@@ -57,7 +79,8 @@ def download_video(video_url, output_path):
     """
     try:
         logger.info(f"Downloading visual: {output_path}...")
-        response = requests.get(video_url, stream=True)
+        # The read timeout applies per chunk, so large files are not cut off
+        response = get_session().get(video_url, stream=True, timeout=(10, 60))
         response.raise_for_status()
 
         output_path = Path(output_path)
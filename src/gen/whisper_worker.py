@@ -0,0 +1,175 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def _serve(conn, model_name, threads, cpus):
+    """Worker process: loads the model once, then answers transcription requests."""
+    try:
+        if cpus and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cpus)
+        # Must be set before torch is imported to size its thread pools
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ[var] = str(threads)
+        import torch
+        import whisper
+
+        torch.set_num_threads(threads)
+        model = whisper.load_model(model_name, device="cpu")
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        return
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        audio_path, language = request
+        try:
+            result = model.transcribe(
+                audio_path, language=language, word_timestamps=True, fp16=False
+            )
+            words = [
+                {
+                    "word": word["word"].strip(),
+                    "start": float(word["start"]),
+                    "end": float(word["end"]),
+                }
+                for segment in result.get("segments", [])
+                for word in segment.get("words", [])
+                if word["word"].strip()
+            ]
+            conn.send(("ok", words))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class WhisperWorker:
+    """
+    A long-lived process holding a loaded whisper model, so transcriptions pay
+    neither the model load nor any network round trip.
+
+    The process runs torch with `threads` threads, optionally pinned to the
+    `cpus` core ids, so it does not compete with renders for every core.
+    Requests are served one at a time; a dead or hung worker is restarted on the
+    next request.
+    """
+
+    def __init__(self, model_name="base", threads=2, cpus=None, timeout=600):
+        self.model_name = model_name
+        self.threads = threads
+        self.cpus = cpus
+        self.timeout = timeout
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        started = time.time()
+        # spawn: the worker must not inherit the parent's threads or torch state
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_serve,
+            args=(child_conn, self.model_name, self.threads, self.cpus),
+            name="whisper-worker",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+
+        if not self._conn.poll(self.timeout):
+            self._stop()
+            raise TimeoutError(f"Whisper model '{self.model_name}' did not load")
+        status, error = self._conn.recv()
+        if status != "ready":
+            self._stop()
+            raise RuntimeError(f"Whisper worker failed to start: {error}")
+        logger.info(
+            f"Whisper '{self.model_name}' loaded in {time.time() - started:.1f}s "
+            f"({self.threads} threads, cpus: {self.cpus or 'any'})"
+        )
+
+    def start(self):
+        """Starts the worker and loads the model now instead of on first use."""
+        with self._lock:
+            self._ensure_started()
+
+    def transcribe(self, audio_path, language=None):
+        """Returns [{"word", "start", "end"}] for `audio_path`."""
+        with self._lock:
+            self._ensure_started()
+            started = time.time()
+            self._conn.send((os.path.abspath(audio_path), language))
+            if not self._conn.poll(self.timeout):
+                self._stop()
+                raise TimeoutError(f"Whisper did not finish {audio_path}")
+            status, payload = self._conn.recv()
+        if status != "ok":
+            raise RuntimeError(payload)
+        logger.info(
+            f"Whisper transcribed {len(payload)} words in {time.time() - started:.1f}s"
+        )
+        return payload
+
+    def _stop(self):
+        if self._process is None:
+            return
+        try:
+            self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self._process.join(5)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def stop(self):
+        with self._lock:
+            self._stop()
+
+
+def _parse_cpus(value):
+    """Parses WHISPER_CPUS: "6,7" or "6-7" -> {6, 7}; empty -> None (no pinning)."""
+    cpus = set()
+    for part in (value or "").replace(" ", "").split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.update(range(int(first), int(last) + 1))
+        elif part:
+            cpus.add(int(part))
+    return cpus or None
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_whisper_worker():
+    """Returns the process-wide WhisperWorker configured from WHISPER_* settings."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = WhisperWorker(
+                Config.WHISPER_MODEL,
+                threads=Config.WHISPER_THREADS,
+                cpus=_parse_cpus(Config.WHISPER_CPUS),
+            )
+            atexit.register(_worker.stop)
+        return _worker
@@ -0,0 +1,146 @@
+import contextlib
+import logging
+import os
+
+from src.rendering.ffmpeg_backend import get_ffmpeg_exe, run_ffmpeg
+from src.rendering.governor import get_render_governor
+from src.rendering.profiles import get_profile
+
+logger = logging.getLogger(__name__)
+
+# ASS colours are &HAABBGGRR (alpha 00 = opaque)
+ASS_YELLOW = "&H0000FFFF"
+ASS_BLACK = "&H00000000"
+
+
+def _format_time(seconds):
+    """Formats seconds as the ASS H:MM:SS.cc timestamp."""
+    cs = int(round(max(0.0, seconds) * 100))
+    h, cs = divmod(cs, 360000)
+    m, cs = divmod(cs, 6000)
+    s, cs = divmod(cs, 100)
+    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+
+
+def _escape_text(text):
+    # Braces open override blocks and backslashes start tags in ASS
+    return (
+        str(text)
+        .replace("\\", "")
+        .replace("{", "(")
+        .replace("}", ")")
+        .replace("\n", " ")
+    )
+
+
+def write_ass(
+    words,
+    output_path,
+    width=1080,
+    height=1920,
+    font_name="Liberation Sans",
+    font_size=120,
+    bold=True,
+    outline=3,
+    min_duration=0.1,
+):
+    """
+    Writes word-level subtitles (as returned by subtitles.generate_subtitles_v2)
+    to an ASS file styled like the rendered subtitles: centered yellow text with
+    a black outline, one word on screen at a time.
+
+    Returns the path of the written file.
+    """
+    header = f"""[Script Info]
+ScriptType: v4.00+
+PlayResX: {width}
+PlayResY: {height}
+WrapStyle: 2
+ScaledBorderAndShadow: yes
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Word,{font_name},{font_size},{ASS_YELLOW},{ASS_YELLOW},{ASS_BLACK},{ASS_BLACK},{-1 if bold else 0},0,0,0,100,100,0,0,1,{outline},0,5,0,0,0,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+    lines = []
+    for word in sorted(words, key=lambda w: w["start"]):
+        start = word["start"]
+        end = start + max(min_duration, word["end"] - start)
+        lines.append(
+            f"Dialogue: 0,{_format_time(start)},{_format_time(end)},Word,,0,0,0,,"
+            f"{_escape_text(word['word'])}"
+        )
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(header)
+        f.write("\n".join(lines))
+        f.write("\n")
+    logger.info(f"Wrote {len(lines)} subtitle events to {output_path}")
+    return output_path
+
+
+# A filter option value in a filtergraph is unescaped twice: by the graph parser
+# (special: \ ' [ ] , ;) and then by the filter's option parser (special: \ ' :).
+# Each character is escaped once for each parser it is special to, no quoting.
+_FILTER_PATH_ESCAPES = str.maketrans(
+    {
+        "\\": r"\\\\",
+        "'": r"\\\'",
+        ":": r"\\:",
+        "[": r"\[",
+        "]": r"\]",
+        ",": r"\,",
+        ";": r"\;",
+    }
+)
+
+
+def escape_filter_path(path):
+    """Escapes a file path for use as a filter option value inside a filtergraph."""
+    value = os.path.abspath(path).replace("\\", "/")
+    return value.translate(_FILTER_PATH_ESCAPES)
+
+
+def ass_filter(ass_path, fonts_dir=None):
+    """Returns the `ass` filter expression that burns in `ass_path`."""
+    expr = f"ass={escape_filter_path(ass_path)}"
+    if fonts_dir:
+        expr += f":fontsdir={escape_filter_path(fonts_dir)}"
+    return expr
+
+
+def burn_subtitles(
+    video_path, ass_path, output_path, fonts_dir=None, profile=None, threads=None
+):
+    """
+    Burns an existing .ass file into a video with libass; audio is copied as is.
+    Lets a stored subtitle track be re-burned without regenerating anything.
+
+    Without `threads` the encode waits for a render governor lease and uses its
+    thread count; pass `threads` only when the caller already holds a lease.
+    """
+    profile = profile or get_profile(None)
+    cmd = [
+        get_ffmpeg_exe(),
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        video_path,
+        "-vf",
+        ass_filter(ass_path, fonts_dir),
+    ]
+    cmd += profile.video_args() + ["-c:a", "copy"] + profile.container_params()
+    if threads is None:
+        lease = get_render_governor().lease(os.path.basename(output_path))
+    else:
+        lease = contextlib.nullcontext(threads)
+    with lease as threads:
+        run_ffmpeg(cmd + ["-threads", str(threads), output_path])
+    logger.info(f"Burned {ass_path} into {output_path}")
+    return output_path
@@ -1,6 +1,11 @@
+import functools
 import logging
 import math
+import multiprocessing
 import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import PIL.Image
@@ -23,16 +28,133 @@ from moviepy.editor import (
     concatenate_videoclips,
 )
 
+from src.config import Config
+from src.rendering.ass_export import ass_filter, write_ass
+from src.rendering.ffmpeg_backend import FFmpegRenderer, concat_segments, probe_media
+from src.rendering.fonts import get_font_registry
+from src.rendering.governor import get_render_governor
+from src.rendering.mezzanine import get_mezzanine_cache
+from src.rendering.overlays import SubtitleOverlay
+from src.rendering.profiles import (
+    benchmark_summary,
+    get_profile,
+    intermediate_profile,
+)
+from src.rendering.render_cache import get_render_cache
+from src.rendering.timeline import EditDecisionList, plan_edit
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on distinct subtitle sprites kept in memory. Each entry is only
+# the size of the word's bounding box, so a few hundred fit in a few MB.
+SPRITE_CACHE_SIZE = 512
+
+# Subtitle styling at the full 1920 px height, scaled for other resolutions
+SUBTITLE_FONT_SIZE = 120
+SUBTITLE_STROKE_WIDTH = 3
+
+
+@functools.lru_cache(maxsize=SPRITE_CACHE_SIZE)
+def _render_text_sprite(text, font_path, font_size, color, stroke_width):
+    """
+    Rasterizes `text` into an RGBA array cropped to its bounding box (stroke included).
+    Results are cached, so repeated words in a transcript are drawn only once.
+    """
+    registry = get_font_registry()
+    if font_path == registry.font_path:
+        font = registry.get_font(font_size)
+    elif font_path:
+        font = PIL.ImageFont.truetype(font_path, font_size)
+    else:
+        font = PIL.ImageFont.load_default()
+
+    # Measure text including the stroke, so nothing gets clipped at the edges
+    probe = PIL.ImageDraw.Draw(PIL.Image.new("RGBA", (1, 1)))
+    left, top, right, bottom = probe.textbbox(
+        (0, 0), text, font=font, stroke_width=stroke_width
+    )
+    w = max(1, right - left)
+    h = max(1, bottom - top)
+
+    img = PIL.Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    draw = PIL.ImageDraw.Draw(img)
+    draw.text(
+        (-left, -top),
+        text,
+        font=font,
+        fill=color,
+        stroke_width=stroke_width,
+        stroke_fill="black",
+    )
+
+    sprite = np.array(img)
+    # Shared between clips via the cache, so it must never be modified in place
+    sprite.setflags(write=False)
+    return sprite
+
+
+def default_segment_count():
+    """Parallel render segments for this machine: one per two cores."""
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+def _render_segment_job(job):
+    """Process pool entry point: renders one segment of the timeline (video only)."""
+    renderer = VideoRenderer(
+        resolution=job["resolution"], fps=job["fps"], use_mezzanine=False
+    )
+    return renderer._write_segment(
+        job["entries"],
+        job["words"],
+        job["output_path"],
+        job["profile"],
+        job["threads"],
+        ass=job["ass"],
+        offset=job["offset"],
+    )
+
 
 class VideoRenderer:
-    def __init__(self, resolution=(1080, 1920)):
+    def __init__(
+        self,
+        resolution=(1080, 1920),
+        subtitle_sprites=True,
+        use_mezzanine=None,
+        use_render_cache=None,
+        fps=24,
+    ):
         """
-        Initialize renderer. Default resolution is 1080x1920 (9:16 Short).
+        Initialize renderer. Default resolution is 1080x1920 (9:16 Short) at 24 fps;
+        see `from_quality` for the resolution/fps of an encoding profile.
+        With `subtitle_sprites` enabled, subtitle words are rendered as small
+        cropped images instead of full-frame transparent canvases.
+        With `use_mezzanine` (default from config), stock clips are first
+        normalized through the content-addressed mezzanine cache.
+        With `use_render_cache` (default from config), finished renders are reused
+        when the same inputs are rendered again.
         """
         self.width = resolution[0]
         self.height = resolution[1]
+        self.fps = fps
+        # Subtitles keep the same size relative to the frame at any resolution
+        scale = self.height / 1920
+        self.font_size = max(1, round(SUBTITLE_FONT_SIZE * scale))
+        self.stroke_width = max(1, round(SUBTITLE_STROKE_WIDTH * scale))
+        self.subtitle_sprites = subtitle_sprites
+        self.use_mezzanine = (
+            Config.MEZZANINE_CACHE if use_mezzanine is None else use_mezzanine
+        )
+        self.use_render_cache = (
+            Config.RENDER_CACHE if use_render_cache is None else use_render_cache
+        )
+        self.fonts = get_font_registry()
+        self.font_path = self.fonts.font_path
+
+    @classmethod
+    def from_quality(cls, quality, **kwargs):
+        """Creates a renderer with the resolution and fps of an encoding profile."""
+        profile = get_profile(quality)
+        return cls(resolution=profile.resolution, fps=profile.fps, **kwargs)
 
     def create_test_video(self, output_path, text="Hello World"):
         """
@@ -74,39 +196,27 @@ class VideoRenderer:
             if final_clip:
                 final_clip.close()
 
-    def _create_text_clip_pil(self, text, duration, color="yellow", font_size=120):
+    def _create_text_clip_pil(
+        self, text, duration, color="yellow", font_size=120, sprite=None
+    ):
         """
         Creates a text clip using PIL (no ImageMagick dependency).
+
+        In sprite mode (default follows `self.subtitle_sprites`) the clip is cropped
+        to the text bounding box and should be positioned with `set_position`.
+        Otherwise a full-frame transparent canvas with centered text is returned.
         """
+        if sprite is None:
+            sprite = self.subtitle_sprites
         try:
+            if sprite:
+                img_np = _render_text_sprite(text, self.font_path, font_size, color, 3)
+                return ImageClip(img_np).set_duration(duration).set_position("center")
+
             # Create a transparent image
             img = PIL.Image.new("RGBA", (self.width, self.height), (0, 0, 0, 0))
             draw = PIL.ImageDraw.Draw(img)
-
-            # Try to load a font from the local 'fonts' directory first
-            font_dir = os.path.join(os.path.dirname(__file__), "..", "fonts")
-            font_paths = [
-                os.path.join(font_dir, "LiberationSans-Bold.ttf"),
-                "C:/Windows/Fonts/arialbd.ttf",
-                "C:/Windows/Fonts/arial.ttf",
-                "C:/Windows/Fonts/seguiemj.ttf",
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-                "LiberationSans-Bold",
-                "Arial.ttf",
-                "sans-serif",
-            ]
-            font = None
-            for p in font_paths:
-                try:
-                    if os.path.exists(p):
-                        font = PIL.ImageFont.truetype(p, font_size)
-                        break
-                except Exception:
-                    continue
-
-            if not font:
-                logger.warning("No suitable font found. Loading default.")
-                font = PIL.ImageFont.load_default()
+            font = self.fonts.get_font(font_size)
 
             # Measure text
             try:
@@ -143,6 +253,351 @@ class VideoRenderer:
             logger.error(f"PIL Text rendering failed: {e}")
             return None
 
+    def _subtitle_sprites(self, subtitles):
+        """Renders one (cached) sprite per subtitle word; None where rendering failed."""
+        sprites = []
+        for word in subtitles:
+            try:
+                sprites.append(
+                    _render_text_sprite(
+                        word["word"],
+                        self.font_path,
+                        self.font_size,
+                        "yellow",
+                        self.stroke_width,
+                    )
+                )
+            except Exception as e:
+                logger.error(f"PIL Text rendering failed: {e}")
+                sprites.append(None)
+        return sprites
+
+    def plan_timeline(self, visual_paths, total_duration):
+        """
+        Builds the EditDecisionList for `total_duration` seconds from container
+        metadata only; nothing is decoded until a backend renders the plan.
+        """
+        return plan_edit(
+            visual_paths or [], total_duration, self.width, self.height, fps=self.fps
+        )
+
+    def export_ass(self, subtitles, ass_path, font_size=None):
+        """
+        Writes the subtitle words to an ASS file styled with the renderer's font.
+        Returns (ass_path, fonts_dir) for the `ass` filter.
+        """
+        font_size = font_size or self.font_size
+        font_name, style = "Arial", "Bold"
+        fonts_dir = None
+        if self.font_path:
+            font_name, style = self.fonts.get_font(font_size).getname()
+            fonts_dir = os.path.dirname(os.path.abspath(self.font_path))
+        write_ass(
+            subtitles,
+            ass_path,
+            width=self.width,
+            height=self.height,
+            font_name=font_name,
+            font_size=font_size,
+            bold="Bold" in (style or ""),
+            outline=self.stroke_width,
+        )
+        return ass_path, fonts_dir
+
+    def _assemble_ffmpeg(
+        self,
+        audio_path,
+        edl,
+        subtitles,
+        output_path,
+        profile,
+        ass=None,
+        threads=None,
+    ):
+        """
+        Renders the short with a single ffmpeg filtergraph (no per-frame Python).
+        With `ass` set to (ass_path, fonts_dir), subtitles are burned in by libass
+        instead of overlaying sprites.
+        """
+        # Group words by sprite, so every distinct word is a single overlay input
+        sprites = {}
+        if subtitles and not ass:
+            for word, sprite in zip(subtitles, self._subtitle_sprites(subtitles)):
+                if sprite is None:
+                    continue
+                end = word["start"] + max(0.1, word["end"] - word["start"])
+                entry = sprites.setdefault(id(sprite), (sprite, []))
+                entry[1].append((word["start"], end))
+
+        FFmpegRenderer(self.width, self.height, fps=self.fps).render(
+            edl.segments(),
+            audio_path,
+            output_path,
+            edl.duration,
+            sprites=list(sprites.values()),
+            subtitle_filter=ass_filter(*ass) if ass else None,
+            profile=profile,
+            threads=threads or get_render_governor().threads_per_render,
+        )
+        logger.info(f"Video saved to {output_path}")
+        return output_path
+
+    def _decode_size(self, src_w, src_h):
+        """Smallest (w, h) with the source aspect ratio that covers the output frame."""
+        if src_w / src_h > self.width / self.height:
+            return math.ceil(src_w * self.height / src_h), self.height
+        return self.width, math.ceil(src_h * self.width / src_w)
+
+    def _open_source(self, path):
+        """
+        Opens a source clip scaled and center-cropped to the output size.
+
+        Scaling happens in the ffmpeg decoder process (MoviePy's target_resolution),
+        so Python never receives oversized frames; only the crop is left, which is
+        a cheap array slice. Returns (source, clip); close the source when done.
+        """
+        info = probe_media(path)
+        src_w, src_h = info["width"], info["height"]
+        target = None
+        if src_w and src_h and (src_w, src_h) != (self.width, self.height):
+            w, h = self._decode_size(src_w, src_h)
+            target = (h, w)
+        clip = VideoFileClip(path, target_resolution=target)
+        source = clip
+        if tuple(clip.size) != (self.width, self.height):
+            clip = clip.crop(
+                x_center=clip.w / 2,
+                y_center=clip.h / 2,
+                width=self.width,
+                height=self.height,
+            )
+        return source, clip
+
+    def _write_segment(
+        self,
+        entries,
+        words,
+        output_path,
+        profile,
+        threads,
+        ass=None,
+        offset=0.0,
+    ):
+        """
+        Encodes `entries` ((path, start, duration) tuples) as a video-only file.
+        `words` are subtitle words already shifted to segment time; with `ass`,
+        the track is burned in with its timeline shifted by `offset` seconds.
+        """
+        sources = []
+        video = None
+        try:
+            clips = []
+            for path, start, duration in entries:
+                source, clip = self._open_source(path)
+                sources.append(source)
+                clips.append(clip.subclip(start, start + duration))
+            video = concatenate_videoclips(clips)
+
+            # Same GOP and rate control in every segment, so they concat cleanly
+            ffmpeg_params = profile.x264_params()
+            if ass:
+                ffmpeg_params += [
+                    "-vf",
+                    f"setpts=PTS+{offset:.6f}/TB,{ass_filter(*ass)},"
+                    "setpts=PTS-STARTPTS",
+                ]
+            elif words:
+                overlay = SubtitleOverlay(
+                    words, self._subtitle_sprites(words), (self.width, self.height)
+                )
+                if len(overlay):
+                    video = overlay.apply(video)
+
+            video.write_videofile(
+                output_path,
+                fps=self.fps,
+                codec="libx264",
+                audio=False,
+                preset=profile.preset,
+                threads=threads,
+                ffmpeg_params=ffmpeg_params,
+                logger=None,
+            )
+            return output_path
+        finally:
+            if video:
+                video.close()
+            for source in sources:
+                source.close()
+
+    def _assemble_segmented(
+        self,
+        audio_path,
+        edl,
+        subtitles,
+        output_path,
+        profile,
+        segments,
+        ass=None,
+        threads=None,
+    ):
+        """
+        Splits the timeline at clip boundaries into `segments` parts, encodes them
+        in a process pool with identical encoder settings and joins them with the
+        concat demuxer without re-encoding. The voiceover is muxed once at the end.
+        `threads` is the render's whole thread budget, shared by the segments.
+        """
+        fps = self.fps
+        plan = edl.segments()
+        if not plan:
+            raise RuntimeError("No usable visuals for a segmented render")
+
+        # Whole frames per clip, so segment boundaries fall exactly on frames.
+        # Clip ends are rounded on the timeline rather than each length, so the
+        # error does not add up, and the last is rounded up to cover the audio
+        rounded = []
+        end = frames = 0
+        for i, (path, start, duration) in enumerate(plan):
+            end += duration * fps
+            boundary = math.ceil(end - 1e-6) if i == len(plan) - 1 else round(end)
+            count = max(1, boundary - frames)
+            rounded.append((path, start, count / fps))
+            frames += count
+        plan = rounded
+        threads = threads or get_render_governor().threads_per_render
+        # Each segment process needs at least one core of its own
+        segments = max(1, min(segments, len(plan), threads))
+        target = sum(d for _, _, d in plan) / segments
+
+        groups = [[]]
+        acc = 0.0
+        for entry in plan:
+            if acc >= target * len(groups) and len(groups) < segments:
+                groups.append([])
+            groups[-1].append(entry)
+            acc += entry[2]
+
+        work_dir = output_path + ".segments"
+        os.makedirs(work_dir, exist_ok=True)
+        threads = max(1, threads // len(groups))
+        jobs = []
+        offset = 0.0
+        for i, group in enumerate(groups):
+            length = sum(d for _, _, d in group)
+            words = [
+                dict(w, start=w["start"] - offset, end=w["end"] - offset)
+                for w in subtitles or []
+                if w["end"] > offset and w["start"] < offset + length
+            ]
+            jobs.append(
+                {
+                    "resolution": (self.width, self.height),
+                    "fps": self.fps,
+                    "entries": group,
+                    "words": [] if ass else words,
+                    "output_path": os.path.join(work_dir, f"segment_{i:03d}.mp4"),
+                    "profile": profile,
+                    "threads": threads,
+                    "ass": ass,
+                    "offset": offset,
+                }
+            )
+            offset += length
+
+        logger.info(
+            f"Rendering {len(jobs)} segments in parallel ({threads} threads each)..."
+        )
+        try:
+            # Spawned, not forked: the parent may hold loop threads and locks
+            with ProcessPoolExecutor(
+                max_workers=len(jobs), mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                segment_paths = list(pool.map(_render_segment_job, jobs))
+            concat_segments(
+                segment_paths, audio_path, output_path, work_dir, profile=profile
+            )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        logger.info(f"Video saved to {output_path}")
+        return output_path
+
+    def render_visual_track(
+        self, visual_paths, duration, output_path, quality="easy", edl=None
+    ):
+        """
+        Renders only the B-roll of the edit plan: no audio, no subtitles, at
+        near-lossless intermediate settings. Language variants of the same topic
+        share this track (see `assemble_variant`), so the footage is decoded,
+        scaled and cut once however many variants are made.
+
+        The plan covers `duration` seconds (the longest voiceover of the
+        variants) and is saved next to the track. Returns the track path.
+        """
+        output_path = os.path.abspath(output_path).replace("\\", "/")
+        with get_render_governor().lease(os.path.basename(output_path)) as threads:
+            if edl is None:
+                edl = self.plan_timeline(visual_paths, duration)
+            logger.info(f"Visual track plan: {edl.summary()}")
+            edl.save(os.path.splitext(output_path)[0] + ".edl.json")
+            if edl and self.use_mezzanine:
+                edl = get_mezzanine_cache(
+                    self.width, self.height, self.fps
+                ).normalize_edl(edl, threads=threads)
+
+            started = time.time()
+            FFmpegRenderer(self.width, self.height, fps=self.fps).render(
+                edl.segments(),
+                None,
+                output_path,
+                edl.duration,
+                profile=intermediate_profile(get_profile(quality)),
+                threads=threads,
+            )
+        logger.info(
+            f"Visual track saved to {output_path} in {time.time() - started:.1f}s"
+        )
+        return output_path
+
+    def assemble_variant(
+        self,
+        track_path,
+        audio_path,
+        subtitles=None,
+        output_path="output.mp4",
+        quality="easy",
+        backend="ffmpeg",
+        subtitle_mode=None,
+    ):
+        """
+        Finishes one language variant from a shared visual track: the track is
+        cut to this voiceover's length, the subtitles are burned in and the audio
+        is muxed. That is one decode and encode of the output frame, with no
+        stock footage scaling or cutting.
+        """
+        track_path = os.path.abspath(track_path).replace("\\", "/")
+        duration = probe_media(audio_path)["duration"]
+        length = min(duration, probe_media(track_path)["duration"])
+        edl = EditDecisionList(
+            [{"path": track_path, "in": 0.0, "out": round(length, 3)}],
+            duration,
+            self.width,
+            self.height,
+            self.fps,
+        )
+        return self.assemble_short(
+            audio_path,
+            None,
+            subtitles=subtitles,
+            output_path=output_path,
+            quality=quality,
+            backend=backend,
+            subtitle_mode=subtitle_mode,
+            segments=1,
+            edl=edl,
+            normalize_sources=False,
+        )
+
     def assemble_short(
         self,
         audio_path,
@@ -150,140 +605,236 @@ class VideoRenderer:
         subtitles=None,
         output_path="output.mp4",
         quality="easy",
+        backend=None,
+        subtitle_mode=None,
+        segments=None,
+        edl=None,
+        normalize_sources=True,
     ):
         """
         Assembles the final Shorts video, ensuring all resources are closed.
+
+        `quality` names the encoding profile (see src/rendering/profiles.py).
+
+        `backend` selects the render path: "moviepy" (default, frames pass through
+        Python) or "ffmpeg" (one native filtergraph). If the ffmpeg backend fails,
+        the MoviePy path is used as a fallback.
+
+        `subtitle_mode` is "sprites" (PIL-rendered words) or "ass" (an .ass track is
+        written next to the output and burned in by ffmpeg's libass filter).
+
+        `segments` > 1 (or "auto") renders the MoviePy timeline as that many
+        segments in parallel processes (default from RENDER_SEGMENTS).
+
+        The timeline is planned up front from metadata (see `plan_timeline`) and
+        saved next to the output as <name>.edl.json. Pass a stored plan as `edl`
+        to replay it; `visual_paths` is then ignored. With `normalize_sources` off,
+        the plan's sources are used as they are instead of going through the
+        mezzanine cache (for tracks already rendered in the output format).
+        """
+        # Normalize path for FFMPEG compatibility on Windows
+        output_path = os.path.abspath(output_path).replace("\\", "/")
+        audio_path = os.path.abspath(audio_path).replace("\\", "/")
+        subtitle_mode = (subtitle_mode or Config.SUBTITLE_MODE).lower()
+
+        cache = None
+        fingerprint = None
+        if self.use_render_cache:
+            try:
+                cache = get_render_cache()
+                fingerprint = cache.fingerprint(
+                    audio_path,
+                    edl.paths() if edl else visual_paths,
+                    subtitles,
+                    quality,
+                    (self.width, self.height),
+                    extra={
+                        "subtitle_mode": subtitle_mode,
+                        "edl": edl.to_dict() if edl else None,
+                        "profile": get_profile(quality).to_dict(),
+                    },
+                )
+                if cache.fetch(fingerprint, output_path):
+                    return output_path
+            except Exception as e:
+                logger.warning(f"Render cache unavailable: {e}")
+                fingerprint = None
+
+        # Waits here if the machine is already running as many renders as it can
+        with get_render_governor().lease(os.path.basename(output_path)) as threads:
+            started = time.time()
+            result = self._assemble(
+                audio_path,
+                visual_paths,
+                subtitles,
+                output_path,
+                quality,
+                backend,
+                subtitle_mode,
+                segments,
+                edl,
+                threads,
+                normalize_sources,
+            )
+        if fingerprint and result and os.path.exists(result):
+            cache.store(fingerprint, result, time.time() - started)
+        return result
+
+    def _assemble(
+        self,
+        audio_path,
+        visual_paths,
+        subtitles,
+        output_path,
+        quality,
+        backend,
+        subtitle_mode,
+        segments,
+        edl,
+        threads,
+        normalize_sources=True,
+    ):
         """
-        logger.info("Assembling video...")
+        Renders the short (see `assemble_short`) with `threads` encoder threads;
+        paths are already normalized.
+        """
+        backend = (backend or Config.RENDER_BACKEND).lower()
+        logger.info(
+            f"Assembling video (backend: {backend}, subtitles: {subtitle_mode})..."
+        )
+        profile = get_profile(quality)
+        logger.info(f"Encoding profile: {profile}")
+        recorded = benchmark_summary(profile)
+        if recorded:
+            logger.info(f"Profile '{profile.name}' benchmark: {recorded}")
+
+        if edl is None:
+            total_duration = probe_media(audio_path)["duration"]
+            edl = self.plan_timeline(visual_paths, total_duration)
+        logger.info(f"Edit plan: {edl.summary()}")
+        try:
+            edl.save(os.path.splitext(output_path)[0] + ".edl.json")
+        except OSError as e:
+            logger.warning(f"Could not save edit plan: {e}")
+        if not edl:
+            logger.warning("No usable visuals. Using black screen.")
+
+        # Only the source chunks the plan actually uses are normalized
+        if edl and self.use_mezzanine and normalize_sources:
+            edl = get_mezzanine_cache(self.width, self.height, self.fps).normalize_edl(
+                edl, threads=threads
+            )
+
+        ass = None
+        if subtitles and subtitle_mode == "ass":
+            ass = self.export_ass(subtitles, os.path.splitext(output_path)[0] + ".ass")
+
+        if backend == "ffmpeg":
+            try:
+                return self._assemble_ffmpeg(
+                    audio_path,
+                    edl,
+                    subtitles,
+                    output_path,
+                    profile,
+                    ass=ass,
+                    threads=threads,
+                )
+            except Exception as e:
+                logger.error(f"ffmpeg backend failed, falling back to MoviePy: {e}")
+
+        segments = segments or Config.RENDER_SEGMENTS
+        if segments == "auto":
+            segments = default_segment_count()
+        segments = int(segments)
+        if segments > 1 and edl:
+            try:
+                return self._assemble_segmented(
+                    audio_path,
+                    edl,
+                    subtitles,
+                    output_path,
+                    profile,
+                    segments,
+                    ass=ass,
+                    threads=threads,
+                )
+            except Exception as e:
+                logger.error(f"Segmented render failed, rendering in one pass: {e}")
+
         audio = None
         final_video = None
+        sources = []
         try:
-            # Normalize path for FFMPEG compatibility on Windows
-            output_path = os.path.abspath(output_path).replace("\\", "/")
-            audio_path = os.path.abspath(audio_path).replace("\\", "/")
-
             # 1. Audio
             audio = AudioFileClip(audio_path)
             total_duration = audio.duration
 
-            # 2. Visuals
+            # 2. Visuals (only the planned segments are opened)
             clips = []
-            current_duration = 0
-
-            if not visual_paths:
-                logger.warning("No visuals provided. Using black screen.")
-                clips.append(
-                    ColorClip(
-                        size=(self.width, self.height),
-                        color=(0, 0, 0),
-                        duration=total_duration,
-                    )
-                )
-            else:
-                from random import shuffle, uniform
-
-                original_visuals = list(visual_paths)
-                shuffle(original_visuals)
-                visual_pool = list(original_visuals)
-
-                # If the pool is smaller than needed, extend it by repeating the shuffled list
-                # to avoid reshuffling during video generation.
-                if visual_pool:
-                    # Estimate clips needed. A clip's duration is uniform(3.0, 5.0).
-                    # Use the minimum duration (3.0s) for a conservative estimate.
-                    estimated_clips_needed = math.ceil(total_duration / 3.0)
-                    if len(visual_pool) < estimated_clips_needed:
-                        num_repeats = math.ceil(
-                            estimated_clips_needed / len(visual_pool)
-                        )
-                        visual_pool = visual_pool * int(num_repeats)
-                        shuffle(visual_pool)  # Shuffle the extended pool for variety
-
-                while current_duration < total_duration:
-                    if not visual_pool:
-                        logger.warning(
-                            "Visual pool ran out unexpectedly. "
-                            "This might happen if source videos are very short. "
-                            "Filling the rest with a black screen."
-                        )
-                        break
-
-                    v_path = os.path.abspath(visual_pool.pop(0)).replace("\\", "/")
-                    clip = None
-                    try:
-                        clip = VideoFileClip(v_path)
-                        if clip.w / clip.h > self.width / self.height:
-                            clip = clip.resize(height=self.height)
-                        else:
-                            clip = clip.resize(width=self.width)
-
-                        clip = clip.crop(
-                            x_center=clip.w / 2,
-                            y_center=clip.h / 2,
-                            width=self.width,
-                            height=self.height,
-                        )
-
-                        target_clip_dur = uniform(3.0, 5.0)
-                        start_t = 0
-                        if clip.duration > target_clip_dur + 1.0:
-                            start_t = uniform(0, clip.duration - target_clip_dur)
-
-                        clip_duration = min(
-                            clip.duration - start_t,
-                            target_clip_dur,
-                            total_duration - current_duration,
-                        )
-
-                        if clip_duration > 0.5:
-                            sub_clip = clip.subclip(start_t, start_t + clip_duration)
-                            clips.append(sub_clip)
-                            current_duration += sub_clip.duration
-
-                    except Exception as e:
-                        logger.error(f"Error loading clip {v_path}: {e}")
-                    finally:
-                        if clip:
-                            clip.close()  # Close each visual clip after processing
-
-            if not clips:  # Safety net if all visuals failed
+            opened = {}
+            for v_path, start_t, clip_duration in edl.segments():
+                try:
+                    if v_path not in opened:
+                        source, opened[v_path] = self._open_source(v_path)
+                        # Subclips read through the source, so it is closed at the end
+                        sources.append(source)
+                    clip = opened[v_path]
+                    clips.append(clip.subclip(start_t, start_t + clip_duration))
+                except Exception as e:
+                    logger.error(f"Error loading clip {v_path}: {e}")
+
+            # Fill whatever the footage does not cover with a black screen
+            covered = sum(c.duration for c in clips)
+            if total_duration - covered > 0.05:
                 clips.append(
                     ColorClip(
                         size=(self.width, self.height),
                         color=(0, 0, 0),
-                        duration=total_duration,
+                        duration=total_duration - covered,
                     )
                 )
 
-            final_video = concatenate_videoclips(clips, method="compose")
+            # Every clip is already frame-sized, so frames are passed through as is;
+            # "compose" would allocate and blit a full background per frame
+            frame_size = (self.width, self.height)
+            same_size = all(tuple(c.size) == frame_size for c in clips)
+            final_video = concatenate_videoclips(
+                clips, method="chain" if same_size else "compose"
+            )
             final_video = final_video.set_audio(audio)
 
             # 3. Subtitles
-            if subtitles:
+            ffmpeg_params = profile.x264_params() + profile.container_params()
+            if ass:
+                # Burned in by the encoder process, frames never see the text in Python
+                ffmpeg_params += ["-vf", ass_filter(*ass)]
+            elif subtitles:
                 logger.info("Adding subtitles...")
-                text_clips = []
-                for word in subtitles:
-                    txt, start, end = word["word"], word["start"], word["end"]
-                    duration = max(0.1, end - start)
-                    txt_clip = self._create_text_clip_pil(txt, duration)
-                    if txt_clip:
-                        txt_clip = txt_clip.set_start(start).set_position("center")
-                        text_clips.append(txt_clip)
-
-                if text_clips:
-                    final_video = CompositeVideoClip([final_video] + text_clips)
+                overlay = SubtitleOverlay(
+                    subtitles,
+                    self._subtitle_sprites(subtitles),
+                    (self.width, self.height),
+                )
+                if len(overlay):
+                    final_video = overlay.apply(final_video)
+                logger.info(
+                    f"Subtitle sprite cache: {_render_text_sprite.cache_info()}"
+                )
 
             # Write
-            preset = "faster" if quality == "easy" else "medium"
-            logger.info(f"Writing video with preset: {preset}")
+            logger.info(f"Writing video with preset: {profile.preset}")
             final_video.write_videofile(
                 output_path,
-                fps=24,
+                fps=self.fps,
                 audio_codec="aac",
-                preset=preset,
-                threads=12,
+                audio_bitrate=profile.audio_bitrate,
+                preset=profile.preset,
+                threads=threads,
+                ffmpeg_params=ffmpeg_params,
             )
             logger.info(f"Video saved to {output_path}")
+            return output_path
 
         finally:
             # Explicitly close all major clips to release file handles
@@ -291,6 +842,8 @@ class VideoRenderer:
                 audio.close()
             if final_video:
                 final_video.close()
+            for source in sources:
+                source.close()
             logger.info("Video rendering process finished and resources released.")
 
 
@@ -0,0 +1,312 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+import PIL.Image
+
+from src.rendering.governor import get_render_governor
+from src.rendering.profiles import get_profile
+
+logger = logging.getLogger(__name__)
+
+
+def get_ffmpeg_exe():
+    """Returns the ffmpeg binary used by MoviePy (imageio-ffmpeg), or the one on PATH."""
+    try:
+        import imageio_ffmpeg
+
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which("ffmpeg") or "ffmpeg"
+
+
+def get_ffprobe_exe():
+    """Returns the ffprobe binary on PATH, or None (imageio-ffmpeg ships only ffmpeg)."""
+    return shutil.which("ffprobe")
+
+
+def _parse_rate(rate):
+    try:
+        num, den = rate.split("/")
+        return float(num) / float(den) if float(den) else None
+    except (AttributeError, ValueError):
+        return None
+
+
+def _ffprobe(path, ffprobe):
+    result = subprocess.run(
+        [
+            ffprobe,
+            "-v",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            path,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", errors="replace")[-500:])
+    data = json.loads(result.stdout)
+
+    info = {"duration": 0.0, "width": None, "height": None, "fps": None}
+    try:
+        info["duration"] = float(data.get("format", {}).get("duration") or 0.0)
+    except ValueError:
+        pass
+    for stream in data.get("streams", []):
+        if stream.get("codec_type") != "video" or info["width"]:
+            continue
+        width, height = stream.get("width"), stream.get("height")
+        rotation = stream.get("tags", {}).get("rotate", 0)
+        for side_data in stream.get("side_data_list", []):
+            rotation = side_data.get("rotation", rotation)
+        # Same convention as MoviePy: report the displayed (rotated) size
+        if abs(int(float(rotation))) in (90, 270):
+            width, height = height, width
+        info["width"], info["height"] = width, height
+        info["fps"] = _parse_rate(stream.get("avg_frame_rate")) or _parse_rate(
+            stream.get("r_frame_rate")
+        )
+    return info
+
+
+def _parse_infos(path):
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+    infos = ffmpeg_parse_infos(path)
+    width, height = infos.get("video_size") or (None, None)
+    return {
+        "duration": infos.get("duration") or 0.0,
+        "width": width,
+        "height": height,
+        "fps": infos.get("video_fps"),
+    }
+
+
+_probe_cache = {}
+_probe_lock = threading.Lock()
+
+
+def probe_media(path):
+    """
+    Reads container metadata (no frame decoding) with ffprobe, or by parsing
+    `ffmpeg -i` output when ffprobe is not installed.
+    Returns a dict with duration, width, height and fps (size/fps are None for audio).
+    Results are cached per (path, mtime, size) for the lifetime of the process.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _probe_lock:
+        if key in _probe_cache:
+            return dict(_probe_cache[key])
+
+    ffprobe = get_ffprobe_exe()
+    info = _ffprobe(path, ffprobe) if ffprobe else _parse_infos(path)
+    with _probe_lock:
+        _probe_cache[key] = info
+    return dict(info)
+
+
+def run_ffmpeg(cmd):
+    """Runs an ffmpeg command, raising RuntimeError with the tail of stderr on failure."""
+    logger.debug(f"Running: {' '.join(cmd)}")
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="replace")
+        raise RuntimeError(f"ffmpeg failed ({result.returncode}): {stderr[-2000:]}")
+
+
+def scale_crop_filter(width, height, fps):
+    """Scale to cover width x height, center-crop, fix SAR/fps and pixel format."""
+    return (
+        f"scale={width}:{height}:force_original_aspect_ratio=increase,"
+        f"crop={width}:{height},setsar=1,fps={fps},format=yuv420p"
+    )
+
+
+def _enable_expr(intervals):
+    return "+".join(f"between(t,{start:.3f},{end:.3f})" for start, end in intervals)
+
+
+class FFmpegRenderer:
+    """
+    Renders a short with a single ffmpeg process: every source is trimmed at
+    input level, scaled/cropped and concatenated in one filtergraph, subtitle
+    sprites are overlaid with time-based `enable` expressions and the voiceover
+    is muxed in. No frames pass through Python.
+    """
+
+    def __init__(self, width=1080, height=1920, fps=24):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.ffmpeg = get_ffmpeg_exe()
+
+    def _video_chain(self, label_in, label_out):
+        return (
+            f"[{label_in}]{scale_crop_filter(self.width, self.height, self.fps)},"
+            f"setpts=PTS-STARTPTS[{label_out}]"
+        )
+
+    def build_command(
+        self,
+        segments,
+        audio_path,
+        output_path,
+        total_duration,
+        sprites=None,
+        subtitle_filter=None,
+        work_dir=None,
+        profile=None,
+        threads=None,
+    ):
+        """
+        Builds the ffmpeg argument list.
+
+        Args:
+            segments (list): (path, start, duration) tuples in timeline order.
+            audio_path (str): Voiceover track (None renders a silent video track).
+            output_path (str): Destination MP4.
+            total_duration (float): Length of the final video (audio duration).
+            sprites (list): (rgba_array, [(start, end), ...]) pairs to overlay centered.
+            subtitle_filter (str): Extra filter applied last, e.g. an `ass=` burn-in.
+            work_dir (str): Directory for sprite PNGs and the filtergraph script.
+            profile (EncodingProfile): Encoder settings (default profile if None).
+            threads (int): Encoder threads (the governor's per-render share if None).
+        """
+        work_dir = work_dir or tempfile.mkdtemp(prefix="ffrender_")
+        profile = profile or get_profile(None)
+        threads = threads or get_render_governor().threads_per_render
+        cmd = [self.ffmpeg, "-y", "-hide_banner", "-loglevel", "error"]
+        filters = []
+        labels = []
+        idx = 0
+
+        for path, start, duration in segments:
+            cmd += ["-ss", f"{start:.3f}", "-t", f"{duration:.3f}", "-i", path]
+            filters.append(self._video_chain(f"{idx}:v", f"v{idx}"))
+            labels.append(f"[v{idx}]")
+            idx += 1
+
+        # Pad with black if the footage does not cover the voiceover
+        covered = sum(d for _, _, d in segments)
+        if total_duration - covered > 0.05:
+            cmd += [
+                "-f",
+                "lavfi",
+                "-t",
+                f"{total_duration - covered:.3f}",
+                "-i",
+                f"color=c=black:s={self.width}x{self.height}:r={self.fps}",
+            ]
+            filters.append(self._video_chain(f"{idx}:v", f"v{idx}"))
+            labels.append(f"[v{idx}]")
+            idx += 1
+
+        filters.append(f"{''.join(labels)}concat=n={len(labels)}:v=1:a=0[base]")
+        current = "base"
+
+        for n, (sprite, intervals) in enumerate(sprites or []):
+            png_path = os.path.join(work_dir, f"sprite_{n}.png")
+            PIL.Image.fromarray(sprite).save(png_path)
+            cmd += ["-i", png_path]
+            filters.append(
+                f"[{current}][{idx}:v]overlay=x=(W-w)/2:y=(H-h)/2"
+                f":enable='{_enable_expr(intervals)}'[s{n}]"
+            )
+            current = f"s{n}"
+            idx += 1
+
+        if subtitle_filter:
+            filters.append(f"[{current}]{subtitle_filter}[subs]")
+            current = "subs"
+
+        if audio_path:
+            cmd += ["-i", audio_path]
+
+        # Long transcripts make long graphs, so pass it as a script file
+        graph_path = os.path.join(work_dir, "filtergraph.txt")
+        with open(graph_path, "w", encoding="utf-8") as f:
+            f.write(";\n".join(filters))
+
+        cmd += ["-filter_complex_script", graph_path, "-map", f"[{current}]"]
+        cmd += profile.video_args() + ["-r", str(self.fps)]
+        if audio_path:
+            cmd += ["-map", f"{idx}:a"] + profile.audio_args()
+        else:
+            cmd += ["-an"]
+        cmd += profile.container_params()
+        cmd += [
+            "-threads",
+            str(threads),
+            "-t",
+            f"{total_duration:.3f}",
+            output_path,
+        ]
+        return cmd
+
+    def render(self, segments, audio_path, output_path, total_duration, **kwargs):
+        """Builds and runs the ffmpeg command; the work dir is removed afterwards."""
+        work_dir = tempfile.mkdtemp(prefix="ffrender_")
+        try:
+            cmd = self.build_command(
+                segments,
+                audio_path,
+                output_path,
+                total_duration,
+                work_dir=work_dir,
+                **kwargs,
+            )
+            run_ffmpeg(cmd)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return output_path
+
+
+def concat_segments(segment_paths, audio_path, output_path, work_dir, profile=None):
+    """
+    Joins separately encoded segments with the concat demuxer (video is stream
+    copied, not re-encoded) and muxes the voiceover once over the whole timeline.
+    Not cut to the shorter stream: the segments are whole frames, and the
+    voiceover must never lose its last fraction of a frame.
+    """
+    profile = profile or get_profile(None)
+    list_path = os.path.join(work_dir, "segments.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in segment_paths:
+            safe = os.path.abspath(path).replace("\\", "/").replace("'", "'\\''")
+            f.write(f"file '{safe}'\n")
+
+    cmd = [
+        get_ffmpeg_exe(),
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        list_path,
+        "-i",
+        audio_path,
+        "-map",
+        "0:v",
+        "-map",
+        "1:a",
+        "-c:v",
+        "copy",
+    ]
+    cmd += profile.audio_args() + profile.container_params()
+    cmd += [output_path]
+    run_ffmpeg(cmd)
+    return output_path
@@ -0,0 +1,94 @@
+import logging
+import os
+import threading
+
+import PIL.ImageFont
+
+logger = logging.getLogger(__name__)
+
+FONT_DIR = os.path.join(os.path.dirname(__file__), "..", "fonts")
+
+# Checked in order, the first existing file wins
+FONT_CANDIDATES = [
+    os.path.join(FONT_DIR, "LiberationSans-Bold.ttf"),
+    "C:/Windows/Fonts/arialbd.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "C:/Windows/Fonts/seguiemj.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    "LiberationSans-Bold",
+    "Arial.ttf",
+    "sans-serif",
+]
+
+
+class FontRegistry:
+    """
+    Resolves the subtitle font once per process and caches loaded fonts by (path, size).
+    """
+
+    def __init__(self, candidates=None):
+        self.candidates = list(candidates or FONT_CANDIDATES)
+        self._font_path = None
+        self._resolved = False
+        self._fonts = {}
+        self._lock = threading.Lock()
+
+    @property
+    def font_path(self):
+        """Path of the chosen font file, or None if only the PIL default is available."""
+        if not self._resolved:
+            with self._lock:
+                if not self._resolved:
+                    self._font_path = self._resolve()
+                    self._resolved = True
+        return self._font_path
+
+    def _resolve(self):
+        for p in self.candidates:
+            try:
+                if os.path.exists(p):
+                    PIL.ImageFont.truetype(p, 12)
+                    return p
+            except Exception as e:
+                logger.warning(f"Font {p} exists but could not be loaded: {e}")
+        return None
+
+    def get_font(self, size):
+        """Returns a cached FreeTypeFont for the chosen font at `size`."""
+        key = (self.font_path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            with self._lock:
+                font = self._fonts.get(key)
+                if font is None:
+                    if key[0]:
+                        font = PIL.ImageFont.truetype(key[0], size)
+                    else:
+                        font = PIL.ImageFont.load_default()
+                    self._fonts[key] = font
+        return font
+
+    def report(self):
+        """Logs which font was chosen. Returns False if falling back to the PIL default."""
+        if self.font_path:
+            logger.info(f"Subtitle font: {os.path.abspath(self.font_path)}")
+            return True
+        logger.warning(
+            "No subtitle font found (checked: "
+            f"{', '.join(self.candidates)}). Subtitles will use the PIL default font."
+        )
+        return False
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_font_registry():
+    """Returns the process-wide FontRegistry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = FontRegistry()
+    return _registry
@@ -0,0 +1,111 @@
+import contextlib
+import logging
+import os
+import threading
+import time
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class RenderGovernor:
+    """
+    Shares the machine's cores between concurrent renders in this process.
+
+    Every render takes a lease before encoding. At most `max_concurrent` leases
+    are active; further renders wait in FIFO order until one is released. Each
+    lease gets an equal share of the cores as its encoder thread count, so the
+    active renders together use about one thread per core instead of each
+    starting its own 12.
+    """
+
+    def __init__(self, cpu_count=None, max_concurrent=None):
+        self.cpu_count = max(1, cpu_count or os.cpu_count() or 1)
+        # One render per 4 cores keeps x264 efficient (it scales well up to there)
+        self.max_concurrent = max(
+            1, min(max_concurrent or self.cpu_count // 4, self.cpu_count)
+        )
+        self.active = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+
+    @property
+    def threads_per_render(self):
+        return max(1, self.cpu_count // self.max_concurrent)
+
+    @contextlib.contextmanager
+    def lease(self, name="render"):
+        """
+        Blocks until the render may start, then yields its encoder thread count.
+        The slot is released when the block exits.
+        """
+        waited = time.time()
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self.waiting += 1
+            if self.active >= self.max_concurrent:
+                logger.info(
+                    f"Render queued: {name} ({self.active} active, "
+                    f"{self.waiting - 1} ahead)"
+                )
+            # First come, first served: wait for our turn and a free slot
+            while ticket != self._serving or self.active >= self.max_concurrent:
+                self._cond.wait()
+            self._serving += 1
+            self.waiting -= 1
+            self.active += 1
+            self._cond.notify_all()
+
+        threads = self.threads_per_render
+        waited = time.time() - waited
+        logger.info(
+            f"Render admitted: {name} with {threads} threads "
+            f"({self.active}/{self.max_concurrent} active"
+            + (f", waited {waited:.1f}s)" if waited >= 0.1 else ")")
+        )
+        try:
+            yield threads
+        finally:
+            with self._cond:
+                self.active -= 1
+                self._cond.notify_all()
+
+    def stats(self):
+        return {
+            "cpu_count": self.cpu_count,
+            "max_concurrent": self.max_concurrent,
+            "threads_per_render": self.threads_per_render,
+            "active": self.active,
+            "waiting": self.waiting,
+        }
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_render_governor():
+    """Returns the process-wide RenderGovernor."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            max_concurrent = Config.RENDER_MAX_CONCURRENT
+            _governor = RenderGovernor(
+                max_concurrent=None if max_concurrent == "auto" else int(max_concurrent)
+            )
+        return _governor
+
+
+def configure_render_governor(cpu_count=None, max_concurrent=None):
+    """
+    Replaces the process-wide RenderGovernor, e.g. in a render worker process
+    that owns only `cpu_count` of the machine's cores.
+    """
+    global _governor
+    with _governor_lock:
+        _governor = RenderGovernor(cpu_count=cpu_count, max_concurrent=max_concurrent)
+        return _governor
@@ -0,0 +1,158 @@
+import logging
+import math
+import os
+import threading
+
+from src.config import Config
+from src.rendering.ffmpeg_backend import get_ffmpeg_exe, run_ffmpeg, scale_crop_filter
+from src.utils.disk_cache import DiskCache, file_digest
+
+logger = logging.getLogger(__name__)
+
+# Bump when the transcode settings change, so old intermediates are not reused
+MEZZANINE_VERSION = 3
+# Intermediates cover whole chunks of this many source seconds, aligned to the
+# start of the file, so random in-points into the same clip share a key
+MEZZANINE_CHUNK = 10.0
+# Seconds of source kept around each used range, so a later in/out nudge by a
+# few frames (fps rounding, segment boundaries) stays inside the intermediate
+MEZZANINE_MARGIN = 0.25
+
+
+class MezzanineCache:
+    """
+    Normalizes the parts of downloaded stock clips an edit plan uses into
+    render-ready intermediates (target resolution, constant fps, fixed GOP, no
+    audio), stored under the hash of the source file and the chunks covered.
+    Only the `MEZZANINE_CHUNK`-second chunks around a used range are
+    transcoded, not the whole clip; a later render using any range in those
+    chunks reuses the intermediate instead of decoding and scaling the original
+    4K / odd-framerate download.
+    """
+
+    def __init__(self, root, max_bytes, width=1080, height=1920, fps=24, gop=48):
+        self.cache = DiskCache(root, max_bytes, name="mezzanine")
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.gop = gop
+
+    def key_for(self, path, first_chunk, last_chunk):
+        return (
+            f"{file_digest(path)}_c{first_chunk}-{last_chunk}x{MEZZANINE_CHUNK:g}s"
+            f"_{self.width}x{self.height}_{self.fps}fps_v{MEZZANINE_VERSION}"
+        )
+
+    @staticmethod
+    def chunks_for(start, duration):
+        """First and last chunk index covering `duration` seconds from `start`."""
+        first = int(max(0.0, start - MEZZANINE_MARGIN) // MEZZANINE_CHUNK)
+        last = math.ceil((start + duration + MEZZANINE_MARGIN) / MEZZANINE_CHUNK) - 1
+        return first, max(first, last)
+
+    def _transcode(self, src, dst, start, duration, threads=None):
+        cmd = [
+            get_ffmpeg_exe(),
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            # Input seeking: only the range is decoded (exact, since it re-encodes)
+            "-ss",
+            f"{start:.3f}",
+            "-t",
+            f"{duration:.3f}",
+            "-i",
+            src,
+            "-an",
+            "-vf",
+            scale_crop_filter(self.width, self.height, self.fps),
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-crf",
+            "18",
+            "-g",
+            str(self.gop),
+            "-keyint_min",
+            str(self.gop),
+            "-sc_threshold",
+            "0",
+            "-movflags",
+            "+faststart",
+        ]
+        if threads:
+            cmd += ["-threads", str(threads)]
+        cmd += [dst]
+        run_ffmpeg(cmd)
+
+    def normalize(self, path, start, duration, threads=None):
+        """
+        Returns (intermediate path, offset of `start` in it) for `duration`
+        seconds of `path` from `start`, transcoding the covering chunks on a
+        miss. Falls back to (path, start), the original file, if normalization
+        fails.
+        """
+        try:
+            first, last = self.chunks_for(start, duration)
+            trim_start = first * MEZZANINE_CHUNK
+            offset = round(start - trim_start, 3)
+            # Past the end of a short clip ffmpeg just stops at EOF
+            length = (last - first + 1) * MEZZANINE_CHUNK
+            key = self.key_for(path, first, last)
+            name = f"{os.path.basename(path)} [{trim_start:g}s +{length:g}s]"
+            cached = self.cache.get(key, ".mp4")
+            if cached:
+                logger.info(f"Mezzanine hit: {name}")
+                return cached, offset
+
+            logger.info(f"Mezzanine miss, normalizing: {name}")
+            tmp = self.cache.tmp_path(key, ".mp4")
+            try:
+                self._transcode(path, tmp, trim_start, length, threads=threads)
+                return self.cache.put(key, tmp, ".mp4"), offset
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        except Exception as e:
+            logger.error(f"Mezzanine normalization failed for {path}: {e}")
+            return path, start
+
+    def normalize_edl(self, edl, threads=None):
+        """Returns a copy of `edl` whose entries play from normalized intermediates."""
+
+        def normalize_entry(entry):
+            length = entry["out"] - entry["in"]
+            path, start = self.normalize(
+                entry["path"], entry["in"], length, threads=threads
+            )
+            entry.update({"path": path, "in": start, "out": round(start + length, 3)})
+            return entry
+
+        normalized = edl.map_entries(normalize_entry)
+        stats = self.cache.stats()
+        logger.info(
+            f"Mezzanine cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['entries']} entries, {stats['bytes'] / (1024 * 1024):.1f} MB"
+        )
+        return normalized
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_mezzanine_cache(width=1080, height=1920, fps=24):
+    """Returns the process-wide MezzanineCache for the given output format."""
+    key = (width, height, fps)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = MezzanineCache(
+                Config.MEZZANINE_CACHE_DIR,
+                Config.MEZZANINE_CACHE_MAX_MB * 1024 * 1024,
+                width=width,
+                height=height,
+                fps=fps,
+            )
+        return _caches[key]
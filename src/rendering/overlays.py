@@ -0,0 +1,101 @@
+import bisect
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SubtitleOverlay:
+    """
+    Draws word-level subtitles onto a clip as a single overlay.
+
+    Word start/end times are kept in sorted arrays, so the active word for a frame
+    is found with a binary search and only that sprite is blended. Per-frame cost
+    does not depend on the number of words in the transcript.
+
+    Frames are composited into one preallocated buffer with integer arithmetic
+    over the sprite's bounding box only, so a frame allocates nothing. The
+    returned frame is that buffer, overwritten by the next call; consumers must
+    use it before requesting another frame (MoviePy's writers do).
+    """
+
+    def __init__(self, words, sprites, frame_size, min_duration=0.1):
+        """
+        Args:
+            words (list): Subtitle dicts with "start" and "end" keys (seconds).
+            sprites (list): RGBA uint8 arrays, one per word (None to skip a word).
+            frame_size (tuple): (width, height) of the frames the overlay is applied to.
+            min_duration (float): Minimum on-screen time of a single word.
+        """
+        self.width, self.height = frame_size
+        entries = sorted(
+            (
+                (w["start"], w["start"] + max(min_duration, w["end"] - w["start"]), s)
+                for w, s in zip(words, sprites)
+                if s is not None
+            ),
+            key=lambda e: e[0],
+        )
+        self.starts = [e[0] for e in entries]
+        self.ends = [e[1] for e in entries]
+        self.sprites = [e[2] for e in entries]
+
+        # Repeated words share a sprite array, so prepare each one only once
+        self._prepared = {}
+        self.layers = [self._prepare(s) for s in self.sprites]
+
+        self._buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        # Scratch for the blend, sized for the largest sprite
+        max_h = max((y1 - y0 for (y0, y1, _, _), _, _ in self.layers), default=0)
+        max_w = max((x1 - x0 for (_, _, x0, x1), _, _ in self.layers), default=0)
+        self._scratch = np.empty((max_h, max_w, 3), dtype=np.uint16)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _prepare(self, sprite):
+        key = id(sprite)
+        if key not in self._prepared:
+            h, w = sprite.shape[:2]
+            # Centered placement, clipped to the frame
+            x = (self.width - w) // 2
+            y = (self.height - h) // 2
+            x0, y0 = max(0, x), max(0, y)
+            x1, y1 = min(self.width, x + w), min(self.height, y + h)
+            crop = sprite[y0 - y : y1 - y, x0 - x : x1 - x]
+            alpha = crop[:, :, 3:4].astype(np.uint16)
+            # out = (rgb * a + frame * (255 - a) + 127) // 255; the sprite term and
+            # the rounding are constant, so they are computed once here
+            premultiplied = crop[:, :, :3] * alpha + 127
+            self._prepared[key] = ((y0, y1, x0, x1), premultiplied, 255 - alpha)
+        return self._prepared[key]
+
+    def active_index(self, t):
+        """Index of the word shown at time `t`, or None."""
+        i = bisect.bisect_right(self.starts, t) - 1
+        if i >= 0 and t < self.ends[i]:
+            return i
+        return None
+
+    def blend(self, frame, t):
+        """Returns the shared buffer with the word at `t` blended in, or `frame` if none."""
+        i = self.active_index(t)
+        if i is None:
+            return frame
+        (y0, y1, x0, x1), premultiplied, inverse_alpha = self.layers[i]
+        # Decoded frames are read-only and may be shared, so blend into the buffer;
+        # generated ones need not be uint8 (ColorClip frames are int64)
+        out = self._buffer
+        np.copyto(out, frame, casting="unsafe")
+        region = out[y0:y1, x0:x1]
+        acc = self._scratch[: y1 - y0, : x1 - x0]
+        np.multiply(region, inverse_alpha, out=acc)
+        acc += premultiplied
+        acc //= 255
+        np.copyto(region, acc, casting="unsafe")
+        return out
+
+    def apply(self, clip):
+        """Returns a copy of `clip` with the subtitles drawn on every frame."""
+        return clip.fl(lambda get_frame, t: self.blend(get_frame(t), t))
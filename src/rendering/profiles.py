@@ -0,0 +1,218 @@
+import functools
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Encode speed/size of every profile on a reference short, written by
+# src/scripts/benchmark_profiles.py
+BENCHMARKS_PATH = os.path.join(os.path.dirname(__file__), "profile_benchmarks.json")
+
+DEFAULT_PROFILE = "easy"
+# Qualities from before the named profiles ("medium", "high", ...) rendered with
+# the slower preset, so any other unknown name keeps getting the "hard" profile
+LEGACY_PROFILE = "hard"
+
+
+class EncodingProfile:
+    """
+    A named set of render and x264/AAC settings, selected by `Channel.quality`.
+    Rate control is either constant quality (`crf`) or a target `bitrate` with a
+    matching VBV cap; `gop` is the keyframe interval in frames.
+    """
+
+    def __init__(
+        self,
+        name,
+        resolution=(1080, 1920),
+        fps=24,
+        preset="faster",
+        crf=23,
+        bitrate=None,
+        tune=None,
+        gop=48,
+        pix_fmt="yuv420p",
+        audio_bitrate="128k",
+        faststart=True,
+        description="",
+    ):
+        self.name = name
+        self.resolution = tuple(resolution)
+        self.fps = fps
+        self.preset = preset
+        self.crf = crf
+        self.bitrate = bitrate
+        self.tune = tune
+        self.gop = gop
+        self.pix_fmt = pix_fmt
+        self.audio_bitrate = audio_bitrate
+        self.faststart = faststart
+        self.description = description
+
+    def x264_params(self):
+        """Encoder options other than codec and preset (MoviePy sets those itself)."""
+        params = []
+        if self.bitrate:
+            params += [
+                "-b:v",
+                self.bitrate,
+                "-maxrate",
+                self.bitrate,
+                "-bufsize",
+                _double_rate(self.bitrate),
+            ]
+        elif self.crf is not None:
+            params += ["-crf", str(self.crf)]
+        if self.tune:
+            params += ["-tune", self.tune]
+        if self.gop:
+            params += ["-g", str(self.gop), "-keyint_min", str(self.gop)]
+        params += ["-pix_fmt", self.pix_fmt]
+        return params
+
+    def container_params(self):
+        """Muxer options; faststart moves the index to the front for streaming."""
+        return ["-movflags", "+faststart"] if self.faststart else []
+
+    def video_args(self):
+        """Complete ffmpeg video encoding arguments."""
+        return ["-c:v", "libx264", "-preset", self.preset] + self.x264_params()
+
+    def audio_args(self):
+        return ["-c:a", "aac", "-b:a", self.audio_bitrate]
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "resolution": list(self.resolution),
+            "fps": self.fps,
+            "preset": self.preset,
+            "crf": self.crf,
+            "bitrate": self.bitrate,
+            "tune": self.tune,
+            "gop": self.gop,
+            "pix_fmt": self.pix_fmt,
+            "audio_bitrate": self.audio_bitrate,
+            "faststart": self.faststart,
+        }
+
+    def __repr__(self):
+        return f"EncodingProfile({self.name}: {self.preset}, {self.rate_label()})"
+
+    def rate_label(self):
+        return f"{self.bitrate} VBR" if self.bitrate else f"crf {self.crf}"
+
+
+def _double_rate(rate):
+    """'8M' -> '16M', '2500k' -> '5000k'."""
+    value, unit = rate[:-1], rate[-1]
+    if unit.isdigit():
+        return str(int(rate) * 2)
+    return f"{int(float(value) * 2)}{unit}"
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in [
+        EncodingProfile(
+            "preview",
+            resolution=(540, 960),
+            fps=15,
+            preset="ultrafast",
+            crf=30,
+            gop=30,
+            audio_bitrate="64k",
+            description="Quick check of script, pacing and subtitles",
+        ),
+        EncodingProfile(
+            "easy",
+            preset="faster",
+            crf=23,
+            description="Default for channels; fast encode, normal quality",
+        ),
+        EncodingProfile(
+            "hard",
+            preset="medium",
+            crf=20,
+            audio_bitrate="192k",
+            description="Higher quality at a slower encode",
+        ),
+        # Follows YouTube's upload recommendations for 1080p SDR: ~8 Mbps H.264,
+        # closed GOP of half the frame rate, AAC-LC, moov atom at the front
+        EncodingProfile(
+            "upload",
+            preset="medium",
+            crf=None,
+            bitrate="8M",
+            gop=12,
+            audio_bitrate="192k",
+            description="YouTube recommended bitrate and GOP",
+        ),
+    ]
+}
+
+
+def get_profile(name):
+    """
+    Returns the named profile. No name gives the default profile; unknown names
+    fall back to `LEGACY_PROFILE`.
+    """
+    if not name:
+        return PROFILES[DEFAULT_PROFILE]
+    profile = PROFILES.get(name.lower())
+    if profile is None:
+        logger.warning(f"Unknown encoding profile '{name}', using '{LEGACY_PROFILE}'")
+        profile = PROFILES[LEGACY_PROFILE]
+    return profile
+
+
+def intermediate_profile(profile):
+    """
+    Settings for a track that is encoded again later (e.g. the shared visual
+    track of language variants): same format and GOP as `profile`, but close to
+    lossless so the second encode does not compound the quality loss.
+    """
+    return EncodingProfile(
+        f"{profile.name}-intermediate",
+        resolution=profile.resolution,
+        fps=profile.fps,
+        preset="veryfast",
+        crf=16,
+        gop=profile.gop,
+        pix_fmt=profile.pix_fmt,
+        audio_bitrate=profile.audio_bitrate,
+        faststart=False,
+        description=f"Intermediate for the '{profile.name}' profile",
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def load_benchmarks(path=BENCHMARKS_PATH):
+    """
+    Returns the recorded benchmark results by profile name ({} if none).
+    Read once per process; treat the result as read-only.
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("profiles", {})
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read profile benchmarks {path}: {e}")
+        return {}
+
+
+def benchmark_summary(profile):
+    """
+    One line with the encode speed and bitrate recorded for `profile` on the
+    reference short, or None if it was not benchmarked with these settings.
+    """
+    recorded = load_benchmarks().get(profile.name)
+    if not recorded or recorded.get("settings") != profile.to_dict():
+        return None
+    return (
+        f"recorded {recorded['encode_fps']} fps "
+        f"({recorded['realtime_factor']}x realtime), "
+        f"{recorded['bitrate_kbps']} kbps on the reference short"
+    )
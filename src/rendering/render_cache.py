@@ -0,0 +1,104 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+
+from src.config import Config
+from src.utils.disk_cache import DiskCache, file_digest
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a change to the render code alters the output for the same inputs
+RENDERER_VERSION = 1
+
+
+class RenderCache:
+    """
+    Finished renders stored under a fingerprint of everything that determines
+    the output, so a retried or repeated render returns the existing file
+    instead of re-encoding it.
+    """
+
+    def __init__(self, root, max_bytes):
+        # The .json sidecar holds the encode time, for the saved-time stats
+        self.cache = DiskCache(
+            root, max_bytes, name="render", sidecars={".mp4": (".json",)}
+        )
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def fingerprint(
+        self,
+        audio_path,
+        visual_paths,
+        subtitles,
+        quality,
+        resolution,
+        extra=None,
+    ):
+        """SHA-256 over the input file contents and render settings."""
+        payload = {
+            "renderer_version": RENDERER_VERSION,
+            "audio": file_digest(audio_path),
+            # The timeline is a random pick from the pool, so order does not matter
+            "visuals": sorted(file_digest(p) for p in visual_paths or []),
+            "subtitles": subtitles or [],
+            "quality": quality,
+            "resolution": list(resolution),
+            "extra": extra or {},
+        }
+        blob = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def fetch(self, fingerprint, output_path):
+        """Places the cached render at `output_path`. Returns True on a hit."""
+        cached = self.cache.get(fingerprint, ".mp4")
+        if not cached:
+            logger.info(f"Render cache miss: {fingerprint[:12]}")
+            return False
+
+        # A real copy, not a hardlink: encoders overwrite outputs in place, which
+        # would otherwise corrupt the cache entry on the next render to that path
+        shutil.copyfile(cached, output_path)
+        encode_seconds = 0.0
+        meta_path = self.cache.path_for(fingerprint, ".json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                encode_seconds = json.load(f).get("encode_seconds", 0.0)
+        with self._lock:
+            self.saved_seconds += encode_seconds
+        stats = self.cache.stats()
+        logger.info(
+            f"Render cache hit: {fingerprint[:12]}, saved ~{encode_seconds:.1f}s "
+            f"of encoding ({self.saved_seconds:.1f}s total, "
+            f"{stats['hits']} hits / {stats['misses']} misses)"
+        )
+        return True
+
+    def store(self, fingerprint, output_path, encode_seconds):
+        """Adds a finished render to the cache."""
+        try:
+            with open(self.cache.path_for(fingerprint, ".json"), "w") as f:
+                json.dump({"encode_seconds": round(encode_seconds, 2)}, f)
+            tmp = self.cache.tmp_path(fingerprint, ".mp4")
+            shutil.copyfile(output_path, tmp)
+            self.cache.put(fingerprint, tmp, ".mp4")
+        except OSError as e:
+            logger.warning(f"Could not store render in cache: {e}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_render_cache():
+    """Returns the process-wide RenderCache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RenderCache(
+                Config.RENDER_CACHE_DIR, Config.RENDER_CACHE_MAX_MB * 1024 * 1024
+            )
+        return _cache
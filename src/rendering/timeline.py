@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+import random
+
+from src.rendering.ffmpeg_backend import probe_media
+
+logger = logging.getLogger(__name__)
+
+
+class EditDecisionList:
+    """
+    The render plan: ordered {"path", "in", "out"} entries (seconds in the source)
+    that cover `duration` seconds of output. Built from metadata only, so it can
+    be logged, saved, replayed and handed to any render backend before a single
+    frame is decoded.
+    """
+
+    VERSION = 1
+
+    def __init__(self, entries, duration, width=1080, height=1920, fps=24):
+        self.entries = [dict(e) for e in entries]
+        self.duration = duration
+        self.width = width
+        self.height = height
+        self.fps = fps
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def covered(self):
+        return sum(e["out"] - e["in"] for e in self.entries)
+
+    def segments(self):
+        """(path, start, duration) tuples in timeline order."""
+        return [(e["path"], e["in"], e["out"] - e["in"]) for e in self.entries]
+
+    def paths(self):
+        """Distinct source paths in order of first use."""
+        return list(dict.fromkeys(e["path"] for e in self.entries))
+
+    def remap(self, mapping):
+        """Returns a copy with source paths replaced through `mapping`."""
+        return self.map_entries(
+            lambda e: dict(e, path=mapping.get(e["path"], e["path"]))
+        )
+
+    def map_entries(self, fn):
+        """Returns a copy with every entry replaced by `fn(entry)`."""
+        return EditDecisionList(
+            [fn(dict(e)) for e in self.entries],
+            self.duration,
+            self.width,
+            self.height,
+            self.fps,
+        )
+
+    def summary(self):
+        return (
+            f"{len(self.entries)} clips from {len(self.paths())} sources, "
+            f"{self.covered:.2f}s of {self.duration:.2f}s"
+        )
+
+    def to_dict(self):
+        return {
+            "version": self.VERSION,
+            "duration": self.duration,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "entries": self.entries,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["entries"],
+            data["duration"],
+            data.get("width", 1080),
+            data.get("height", 1920),
+            data.get("fps", 24),
+        )
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def plan_edit(
+    visual_paths,
+    duration,
+    width=1080,
+    height=1920,
+    fps=24,
+    clip_range=(3.0, 5.0),
+    min_clip=0.5,
+    seed=None,
+):
+    """
+    Computes an EditDecisionList covering `duration` seconds from `visual_paths`,
+    probing duration/size/fps only (nothing is decoded).
+
+    Sources are used in shuffled order, each once per pass, with a random
+    `clip_range` long window per use. Unreadable or too short files are dropped
+    up front instead of being discovered mid-render.
+    """
+    rng = random.Random(seed)
+
+    sources = []
+    for path in dict.fromkeys(
+        os.path.abspath(p).replace("\\", "/") for p in visual_paths
+    ):
+        try:
+            info = probe_media(path)
+        except Exception as e:
+            logger.error(f"Error probing clip {path}: {e}")
+            continue
+        if not info["width"] or info["duration"] <= min_clip:
+            logger.warning(f"Skipping unusable clip {path}: {info}")
+            continue
+        sources.append((path, info["duration"]))
+
+    entries = []
+    covered = 0.0
+    pool = []
+    while sources and duration - covered > 1e-3:
+        if not pool:
+            pool = list(sources)
+            rng.shuffle(pool)
+            # Do not show the same clip twice in a row across passes
+            if entries and len(pool) > 1 and pool[0][0] == entries[-1]["path"]:
+                pool.append(pool.pop(0))
+
+        path, source_duration = pool.pop(0)
+        target = rng.uniform(*clip_range)
+        start = 0.0
+        if source_duration > target + 1.0:
+            start = rng.uniform(0, source_duration - target)
+
+        # Only the tail of the timeline may be shorter than min_clip
+        length = min(source_duration - start, target, duration - covered)
+        entry = {"path": path, "in": round(start, 3), "out": round(start + length, 3)}
+        entries.append(entry)
+        covered += entry["out"] - entry["in"]
+
+    return EditDecisionList(entries, duration, width, height, fps)
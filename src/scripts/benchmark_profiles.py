@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.rendering.ffmpeg_backend import (
+    get_ffmpeg_exe,
+    get_ffprobe_exe,
+    probe_media,
+    run_ffmpeg,
+    scale_crop_filter,
+)
+from src.rendering.profiles import BENCHMARKS_PATH, PROFILES
+
+
+def make_reference(path, duration=20):
+    """
+    Synthesizes a 1080x1920 reference short: moving test pattern with film grain
+    (so it is not trivially compressible) and a tone as the voiceover.
+    """
+    run_ffmpeg(
+        [
+            get_ffmpeg_exe(),
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=s=1080x1920:r=24:d={duration},noise=alls=4:allf=t",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=f=220:d={duration}",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-crf",
+            "16",
+            "-pix_fmt",
+            "yuv420p",
+            "-c:a",
+            "aac",
+            "-shortest",
+            path,
+        ]
+    )
+    return path
+
+
+def moov_before_mdat(path):
+    """True if the MP4 index precedes the media data (playable before fully loaded)."""
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return False
+            size, kind = struct.unpack(">I4s", header)
+            if kind == b"moov":
+                return True
+            if kind == b"mdat":
+                return False
+            if size == 1:
+                size = struct.unpack(">Q", f.read(8))[0] - 8
+            elif size == 0:
+                return False
+            f.seek(size - 8, os.SEEK_CUR)
+
+
+def _run(cmd):
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return result.stdout.decode("utf-8", errors="replace"), result.stderr.decode(
+        "utf-8", errors="replace"
+    )
+
+
+def probe_pix_fmt(path):
+    """Pixel format of the first video stream, as encoded."""
+    ffprobe = get_ffprobe_exe()
+    if ffprobe:
+        out, _ = _run(
+            [ffprobe, "-v", "error", "-select_streams", "v:0"]
+            + ["-show_entries", "stream=pix_fmt", "-of", "csv=p=0", path]
+        )
+        return out.strip() or None
+    # e.g. "Stream #0:0(und): Video: h264 (High) (avc1 / 0x31637661), yuv420p, ..."
+    _, err = _run([get_ffmpeg_exe(), "-hide_banner", "-i", path])
+    match = re.search(r"Video: [^,]+, (\w+)", err)
+    return match.group(1) if match else None
+
+
+def probe_keyframe_times(path):
+    """Timestamps (s) of the video keyframes; only keyframes are decoded."""
+    ffprobe = get_ffprobe_exe()
+    if ffprobe:
+        out, _ = _run(
+            [ffprobe, "-v", "error", "-select_streams", "v:0", "-skip_frame", "nokey"]
+            + ["-show_entries", "frame=pts_time", "-of", "csv=p=0", path]
+        )
+        times = out.split()
+    else:
+        _, err = _run(
+            [get_ffmpeg_exe(), "-hide_banner", "-skip_frame", "nokey", "-i", path]
+            + ["-map", "0:v:0", "-vf", "showinfo", "-f", "null", "-"]
+        )
+        times = re.findall(r"pts_time:([-\d.]+)", err)
+    return sorted(float(t) for t in times if t not in ("", "N/A"))
+
+
+def max_keyframe_interval(path, duration):
+    """Longest stretch without a keyframe, including the tail up to `duration`."""
+    times = probe_keyframe_times(path)
+    if not times:
+        return None
+    gaps = [b - a for a, b in zip(times, times[1:])] + [duration - times[-1]]
+    return round(max(gaps), 2)
+
+
+def benchmark_profile(profile, reference, output_path, threads):
+    """Encodes the reference with `profile`; returns speed, size and upload checks."""
+    width, height = profile.resolution
+    cmd = [
+        get_ffmpeg_exe(),
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        reference,
+        "-vf",
+        scale_crop_filter(width, height, profile.fps),
+    ]
+    cmd += profile.video_args() + profile.audio_args() + profile.container_params()
+    cmd += ["-threads", str(threads), output_path]
+
+    started = time.perf_counter()
+    run_ffmpeg(cmd)
+    seconds = time.perf_counter() - started
+
+    duration = probe_media(output_path)["duration"]
+    size = os.path.getsize(output_path)
+    frames = round(duration * profile.fps)
+    return {
+        "settings": profile.to_dict(),
+        "encode_seconds": round(seconds, 2),
+        "encode_fps": round(frames / seconds, 1),
+        "realtime_factor": round(duration / seconds, 2),
+        "size_bytes": size,
+        "bitrate_kbps": round(size * 8 / duration / 1000) if duration else None,
+        "checks": {
+            "faststart": moov_before_mdat(output_path),
+            # Measured on the output, not taken from the profile settings
+            "pix_fmt": probe_pix_fmt(output_path),
+            "max_keyframe_interval_s": max_keyframe_interval(output_path, duration),
+        },
+    }
+
+
+def run(reference=None, profiles=None, output=BENCHMARKS_PATH, threads=None):
+    threads = threads or os.cpu_count() or 1
+    work_dir = tempfile.mkdtemp(prefix="profile_bench_")
+    try:
+        if not reference:
+            reference = make_reference(os.path.join(work_dir, "reference.mp4"))
+            source = "synthetic testsrc2 + light grain, 1080x1920 24 fps"
+        else:
+            source = os.path.basename(reference)
+        info = probe_media(reference)
+
+        results = {}
+        for name in profiles or PROFILES:
+            print(f"Benchmarking profile '{name}'...")
+            output_path = os.path.join(work_dir, f"{name}.mp4")
+            results[name] = r = benchmark_profile(
+                PROFILES[name], reference, output_path, threads
+            )
+            os.remove(output_path)
+            print(
+                f"  {r['encode_fps']} fps, {r['encode_seconds']}s, "
+                f"{r['size_bytes'] / (1024 * 1024):.2f} MB ({r['bitrate_kbps']} kbps)"
+            )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "cpu_count": os.cpu_count(),
+            "threads": threads,
+            "platform": platform.platform(),
+        },
+        "reference": {
+            "source": source,
+            "duration": round(info["duration"], 2),
+            "width": info["width"],
+            "height": info["height"],
+        },
+        "profiles": results,
+    }
+    if (os.cpu_count() or 1) == 1:
+        report["machine"]["note"] = (
+            "Recorded on a single-core machine: encode speeds are far below a "
+            "multi-core render host and do not show how profiles scale with threads"
+        )
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"Results written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure encode speed and size of every encoding profile"
+    )
+    parser.add_argument(
+        "--reference", help="Reference short to encode (default: synthesized)"
+    )
+    parser.add_argument(
+        "--profile", action="append", choices=sorted(PROFILES), help="Profile(s) to run"
+    )
+    parser.add_argument("--output", default=BENCHMARKS_PATH, help="Results JSON path")
+    parser.add_argument("--threads", type=int, default=None, help="Encoder threads")
+    args = parser.parse_args()
+
+    run(args.reference, args.profile, args.output, args.threads)
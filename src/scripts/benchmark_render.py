@@ -0,0 +1,304 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Add project root to sys.path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.rendering.ffmpeg_backend import get_ffmpeg_exe, run_ffmpeg
+from src.rendering.profiles import PROFILES
+
+# Stock footage comes in all shapes; each clip is scaled/cropped to 1080x1920
+CLIP_SIZES = [(1920, 1080), (1280, 720), (1080, 1920), (2560, 1440)]
+
+# Render paths: backend, subtitle mode and parallel segments
+RENDER_PATHS = {
+    "moviepy": {"backend": "moviepy", "subtitle_mode": "sprites", "segments": 1},
+    "moviepy-ass": {"backend": "moviepy", "subtitle_mode": "ass", "segments": 1},
+    "moviepy-segmented": {
+        "backend": "moviepy",
+        "subtitle_mode": "sprites",
+        "segments": "auto",
+    },
+    "ffmpeg": {"backend": "ffmpeg", "subtitle_mode": "sprites", "segments": 1},
+    "ffmpeg-ass": {"backend": "ffmpeg", "subtitle_mode": "ass", "segments": 1},
+}
+
+WORDS = (
+    "this is a synthetic transcript used to benchmark subtitle rendering with "
+    "words of different lengths like extraordinary and a"
+).split()
+
+
+def _ffmpeg_lavfi(source, output_path, extra_args):
+    run_ffmpeg(
+        [
+            get_ffmpeg_exe(),
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            source,
+        ]
+        + extra_args
+        + [output_path]
+    )
+    return output_path
+
+
+def make_assets(work_dir, duration):
+    """
+    Generates the render inputs locally: one testsrc2 clip per CLIP_SIZES entry,
+    a tone as the voiceover and a word list at about 2.5 words per second.
+    """
+    clip_duration = max(3.0, duration / 2)
+    clips = []
+    for i, (w, h) in enumerate(CLIP_SIZES):
+        clips.append(
+            _ffmpeg_lavfi(
+                f"testsrc2=s={w}x{h}:r=30:d={clip_duration}",
+                os.path.join(work_dir, f"clip_{i}_{w}x{h}.mp4"),
+                ["-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p"],
+            )
+        )
+    audio = _ffmpeg_lavfi(
+        f"sine=f=220:d={duration}",
+        os.path.join(work_dir, "voiceover.mp3"),
+        ["-c:a", "libmp3lame", "-b:a", "128k"],
+    )
+
+    words = []
+    t = 0.0
+    while t < duration - 0.4:
+        word = WORDS[len(words) % len(WORDS)]
+        words.append({"word": word, "start": round(t, 3), "end": round(t + 0.35, 3)})
+        t += 0.4
+    return {"clips": clips, "audio": audio, "words": words}
+
+
+def run_case(case):
+    """
+    Renders one (path, quality) case in this process and returns its metrics.
+    Run through `--case` in a fresh interpreter, so peak RSS is per case.
+    """
+    import resource
+
+    from src.rendering.engine import VideoRenderer
+    from src.rendering.profiles import get_profile
+
+    path = RENDER_PATHS[case["path"]]
+    profile = get_profile(case["quality"])
+    renderer = VideoRenderer.from_quality(
+        case["quality"],
+        use_mezzanine=case.get("mezzanine", False),
+        use_render_cache=False,
+    )
+
+    started = time.perf_counter()
+    renderer.assemble_short(
+        case["audio"],
+        case["clips"],
+        subtitles=case["words"],
+        output_path=case["output_path"],
+        quality=case["quality"],
+        backend=path["backend"],
+        subtitle_mode=path["subtitle_mode"],
+        segments=path["segments"],
+    )
+    seconds = time.perf_counter() - started
+
+    # ru_maxrss is in KB on Linux; children covers ffmpeg and segment workers
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    frames = round(case["duration"] * profile.fps)
+    return {
+        "path": case["path"],
+        "quality": case["quality"],
+        "wall_seconds": round(seconds, 2),
+        "frames": frames,
+        "fps": round(frames / seconds, 2),
+        "peak_rss_mb": round(self_rss / 1024, 1),
+        "peak_child_rss_mb": round(child_rss / 1024, 1),
+        "output_bytes": os.path.getsize(case["output_path"]),
+    }
+
+
+def compare(report, baseline_path, tolerance=0.2):
+    """
+    Prints the fps change of every case against a previous report and returns the
+    cases that got slower by more than `tolerance` (0.2 = 20%).
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {
+            (r["path"], r["quality"]): r
+            for r in json.load(f)["results"]
+            if "error" not in r
+        }
+
+    regressions = []
+    for result in report["results"]:
+        before = baseline.get((result["path"], result["quality"]))
+        if not before or "error" in result:
+            continue
+        change = result["fps"] / before["fps"] - 1
+        print(
+            f"{result['path']} / {result['quality']}: {before['fps']} -> "
+            f"{result['fps']} fps ({change:+.0%})"
+        )
+        if change < -tolerance:
+            regressions.append(result)
+    return regressions
+
+
+def _git_revision():
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=PROJECT_ROOT,
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+            or None
+        )
+    except OSError:
+        return None
+
+
+def run(
+    paths=None, qualities=None, duration=15.0, output=None, keep=False, mezzanine=False
+):
+    paths = paths or list(RENDER_PATHS)
+    qualities = qualities or list(PROFILES)
+    work_dir = tempfile.mkdtemp(prefix="render_bench_")
+    results = []
+    try:
+        print(f"Generating synthetic assets ({duration:.0f}s) in {work_dir}...")
+        assets = make_assets(work_dir, duration)
+
+        for path in paths:
+            for quality in qualities:
+                case = dict(
+                    assets,
+                    path=path,
+                    quality=quality,
+                    duration=duration,
+                    output_path=os.path.join(work_dir, f"{path}_{quality}.mp4"),
+                    mezzanine=mezzanine,
+                )
+                env = dict(os.environ)
+                if mezzanine:
+                    # A cold cache per case: the cost a first render pays
+                    env["MEZZANINE_CACHE_DIR"] = os.path.join(
+                        work_dir, f"mezzanine_{path}_{quality}"
+                    )
+                print(f"Rendering {path} / {quality}...")
+                proc = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--case", "-"],
+                    input=json.dumps(case),
+                    capture_output=True,
+                    text=True,
+                    cwd=work_dir,
+                    env=env,
+                )
+                if proc.returncode != 0:
+                    error = (proc.stderr.strip().splitlines() or ["unknown"])[-1]
+                    print(f"  failed: {error}")
+                    results.append({"path": path, "quality": quality, "error": error})
+                    continue
+                result = json.loads(proc.stdout.strip().splitlines()[-1])
+                print(
+                    f"  {result['fps']} fps, {result['wall_seconds']}s, "
+                    f"peak RSS {result['peak_rss_mb']} MB, "
+                    f"{result['output_bytes'] / (1024 * 1024):.2f} MB"
+                )
+                results.append(result)
+    finally:
+        if not keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "machine": {
+            "cpu_count": os.cpu_count(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+        },
+        "duration": duration,
+        "mezzanine": mezzanine,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Results written to {output}")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark VideoRenderer.assemble_short on synthetic inputs"
+    )
+    parser.add_argument(
+        "--path", action="append", choices=list(RENDER_PATHS), help="Render path(s)"
+    )
+    parser.add_argument(
+        "--quality", action="append", choices=list(PROFILES), help="Profile(s)"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=15.0, help="Voiceover length in seconds"
+    )
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument(
+        "--compare", help="Previous report; exit 1 if a case got slower"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed fps drop against --compare (default 0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the generated assets and renders"
+    )
+    parser.add_argument(
+        "--mezzanine",
+        action="store_true",
+        help="Normalize the clips through a cold mezzanine cache first",
+    )
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        # Worker mode: one case as JSON on stdin, metrics as JSON on stdout
+        result = run_case(json.loads(sys.stdin.read()))
+        print(json.dumps(result))
+    else:
+        report = run(
+            args.path,
+            args.quality,
+            args.duration,
+            args.output,
+            args.keep,
+            args.mezzanine,
+        )
+        if args.compare:
+            regressions = compare(report, args.compare, args.tolerance)
+            if regressions:
+                print(f"{len(regressions)} case(s) regressed")
+                sys.exit(1)
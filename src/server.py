@@ -10,6 +10,7 @@ from flask import Flask, jsonify, request
 from main import run_for_channel, run_full_cycle
 from src.config import Config
 from src.factory import create_content
+from src.rendering.fonts import get_font_registry
 from src.utils.db import Channel, SessionLocal, UploadHistory, init_db
 from src.utils.notifications import send_telegram_message, send_telegram_video
 
@@ -20,6 +21,10 @@ logger = logging.getLogger("server")
 run_lock = threading.Lock()
 job_info = {"status": "Idle", "start_time": None, "current_job": None}
 
+# Resolve the subtitle font at startup, so a missing font shows up in the logs
+# before the first render instead of as default-font output mid-batch
+get_font_registry().report()
+
 
 def start_async_task(coro, job_name="Unknown"):
     """Helper to run async coroutines from Flask routes in a background thread."""
@@ -116,9 +121,11 @@ def render_test():
     topic = data.get("topic", "Test Topic")
     channel = data.get("channel", "TestChannel")
     lang = data.get("lang", "ru")
+    # "preview" renders a small, fast 540x960 version for checking the content
+    quality = data.get("quality", "easy")
 
     if start_async_task(
-        asyncio.to_thread(create_content, topic, channel, lang),
+        asyncio.to_thread(create_content, topic, channel, lang, quality),
         f"Test Render: {topic}",
     ):
         return jsonify({"status": "Test render started in background."})
@@ -132,6 +139,7 @@ def render_custom():
     data = request.json
     topic = data.get("topic")
     lang = data.get("lang", "ru")
+    quality = data.get("quality", "easy")
 
     if not topic:
         return jsonify({"error": "Topic is required"}), 400
@@ -140,12 +148,15 @@ def render_custom():
         try:
             logger.info(f"Custom render started for topic: {topic}")
             video_path = create_content(
-                topic, channel_name="CustomOrder", language=lang
+                topic, channel_name="CustomOrder", language=lang, quality=quality
             )
             if video_path and os.path.exists(video_path):
                 send_telegram_video(
                     video_path,
-                    caption=f"🎬 <b>Custom Video Ready!</b>\nTopic: {topic}\nLang: {lang}",
+                    caption=(
+                        f"🎬 <b>Custom Video Ready!</b>\nTopic: {topic}\n"
+                        f"Lang: {lang}\nQuality: {quality}"
+                    ),
                 )
                 logger.info(f"Custom video sent to Telegram: {video_path}")
             else:
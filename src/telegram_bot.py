@@ -46,7 +46,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "Available commands:\n"
         "/status - Get engine status\n"
         "/channels - Manage channels (List / Run / Delete)\n"
-        "/generate &lt;topic&gt; [en|ru] - Generate video & send to chat\n"
+        "/generate &lt;topic&gt; [en|ru] [preview] - Generate video & send to chat\n"
         "/run <i>account_name</i> <i>channel_name</i> - Trigger specific channel\n"
         "/add_channel <i>json</i> - Add new channel configuration\n"
         "/del_channel <i>account_name</i> <i>channel_name</i> - Remove channel from system\n"
@@ -246,23 +246,29 @@ async def del_channel_command(update: Update, context: ContextTypes.DEFAULT_TYPE
 async def generate_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Triggers custom video generation."""
     if not context.args:
-        await update.message.reply_text("Usage: /generate <Topic> [en|ru]")
+        await update.message.reply_text("Usage: /generate <Topic> [en|ru] [preview]")
         return
 
     args = context.args
     lang = "ru"
+    quality = "easy"
     topic_words = args
 
-    if len(args) > 1 and args[-1].lower() in ["en", "ru"]:
-        lang = args[-1].lower()
-        topic_words = args[:-1]
+    # Optional trailing flags, in any order: language and/or "preview"
+    while len(topic_words) > 1 and topic_words[-1].lower() in ["en", "ru", "preview"]:
+        flag = topic_words[-1].lower()
+        if flag == "preview":
+            quality = "preview"
+        else:
+            lang = flag
+        topic_words = topic_words[:-1]
 
     topic = " ".join(topic_words)
 
     try:
         response = requests.post(
             f"{API_BASE_URL}/render/custom",
-            json={"topic": topic, "lang": lang},
+            json={"topic": topic, "lang": lang, "quality": quality},
             timeout=15,
         )
         if response.status_code == 200:
@@ -271,7 +277,8 @@ async def generate_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_html(
                 f"🎬 <b>Generation started!</b>\n"
                 f"Topic: <i>{safe_topic}</i>\n"
-                f"Language: <i>{safe_lang}</i>\n\n"
+                f"Language: <i>{safe_lang}</i>\n"
+                f"Quality: <i>{quality}</i>\n\n"
                 f"The video will be sent to you automatically when ready."
             )
         else:
@@ -0,0 +1,132 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("disk_cache")
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """Returns the SHA-256 hex digest of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DiskCache:
+    """
+    A directory of files addressed by key, capped in size with LRU eviction.
+    Recency is tracked through file mtimes, so it survives restarts and is shared
+    by every process using the same directory.
+
+    `sidecars` maps a data file suffix to the suffixes of metadata files kept
+    under the same key (e.g. {".mp4": (".json",)}): they count toward the entry's
+    size and are evicted with it. A sidecar without its data file is not counted.
+    """
+
+    def __init__(self, root, max_bytes, name="cache", sidecars=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.name = name
+        self.sidecars = sidecars or {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, key, suffix=""):
+        return os.path.join(self.root, f"{key}{suffix}")
+
+    def get(self, key, suffix=""):
+        """Returns the cached path for `key` (marking it recently used), or None."""
+        path = self.path_for(key, suffix)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+            with self._lock:
+                self.hits += 1
+            return path
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, src_path, suffix=""):
+        """Moves `src_path` into the cache under `key`, then enforces the size cap."""
+        path = self.path_for(key, suffix)
+        os.replace(src_path, path)
+        self.evict(keep=path)
+        return path
+
+    def _entries(self):
+        """(mtime, total size, paths) per entry: a data file plus its sidecars."""
+        files = {}
+        for entry in os.scandir(self.root):
+            if entry.is_file():
+                st = entry.stat()
+                files[entry.name] = (st.st_mtime, st.st_size, entry.path)
+
+        data_suffixes = tuple(self.sidecars)
+        sidecar_suffixes = tuple(
+            suffix for suffixes in self.sidecars.values() for suffix in suffixes
+        )
+        entries = []
+        for name, (mtime, size, path) in files.items():
+            if name.endswith(data_suffixes):
+                data_suffix = next(s for s in data_suffixes if name.endswith(s))
+                key = name[: -len(data_suffix)]
+                paths = [path]
+                for suffix in self.sidecars[data_suffix]:
+                    sidecar = files.get(key + suffix)
+                    if sidecar:
+                        size += sidecar[1]
+                        paths.append(sidecar[2])
+                entries.append((mtime, size, paths))
+            elif not name.endswith(sidecar_suffixes):
+                entries.append((mtime, size, [path]))
+            # Otherwise a sidecar: counted with its data file, or orphaned (the
+            # data file was evicted or is not stored yet) and not counted at all
+        return entries
+
+    def evict(self, keep=None):
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, paths in entries:
+            if total <= self.max_bytes:
+                break
+            if keep in paths:
+                continue
+            try:
+                for path in paths:
+                    os.remove(path)
+                total -= size
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Could not evict {paths[0]}: {e}")
+        if removed:
+            logger.info(
+                f"[{self.name}] Evicted {removed} entries, "
+                f"{total / (1024 * 1024):.1f} MB in use"
+            )
+
+    def tmp_path(self, key, suffix=""):
+        """A temporary path on the cache's filesystem, to be committed with put()."""
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        stamp = f"{os.getpid()}_{threading.get_ident()}_{int(time.time() * 1000)}"
+        return os.path.join(tmp_dir, f"{key}.{stamp}{suffix}")
+
+    def stats(self):
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("job_manifest")
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _hash(data):
+    blob = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _artifact_state(paths):
+    """(size, mtime) of each artifact file; None for files that do not exist."""
+    state = {}
+    for path in paths or []:
+        try:
+            st = os.stat(path)
+            state[path] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            state[path] = None
+    return state
+
+
+class JobManifest:
+    """
+    Per-job record of finished pipeline stages, kept as manifest.json in the job
+    directory.
+
+    Every stage entry stores the stage result, the files it produced with their
+    size/mtime, and a key of its inputs: the stage's own parameters plus the
+    digests of the stages it consumed. A stage counts as done only if its key
+    matches and its files are unchanged, so redoing any upstream stage
+    invalidates everything downstream of it.
+    """
+
+    def __init__(self, job_dir, job=None):
+        self.job_dir = job_dir
+        self.path = os.path.join(job_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self.data = {"job": job or {}, "completed": False, "stages": {}}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+        if job:
+            self.data["job"] = dict(self.data.get("job", {}), **job)
+
+    def inputs_key(self, params, deps=()):
+        """Key for a stage run with `params` on the results of `deps`."""
+        with self._lock:
+            stages = self.data["stages"]
+            digests = {dep: stages.get(dep, {}).get("digest") for dep in deps}
+        return _hash({"params": params, "deps": digests})
+
+    def lookup(self, name, inputs_key):
+        """Returns the stage entry if it is done for these inputs, else None."""
+        with self._lock:
+            entry = self.data["stages"].get(name)
+        if not entry or entry.get("inputs") != inputs_key:
+            return None
+        recorded = entry.get("artifacts", {})
+        if _artifact_state(recorded) != recorded:
+            logger.info(f"Stage '{name}' artifacts changed or missing, redoing it")
+            return None
+        return entry
+
+    def record(self, name, inputs_key, result, artifacts=None, started=None):
+        finished = time.time()
+        state = _artifact_state(artifacts)
+        entry = {
+            "inputs": inputs_key,
+            "result": result,
+            "artifacts": state,
+            "digest": _hash([inputs_key, result, state]),
+            "started_at": started,
+            "finished_at": finished,
+            "seconds": round(finished - started, 2) if started else None,
+        }
+        with self._lock:
+            self.data["stages"][name] = entry
+            self._save()
+        return entry
+
+    def checkpoint(self, name, fn, params=None, artifacts=None, resume=False):
+        """
+        Wraps a StageDAG stage so its result is recorded here. With `resume`, a
+        stage that is already done for the same inputs is skipped and its recorded
+        result returned. `artifacts` maps the result to the files it produced.
+        """
+
+        def run(**deps):
+            key = self.inputs_key(params or {}, sorted(deps))
+            if resume:
+                entry = self.lookup(name, key)
+                if entry:
+                    logger.info(f"Stage '{name}' already done, reusing its result")
+                    return entry["result"]
+            started = time.time()
+            result = fn(**deps)
+            self.record(
+                name, key, result, artifacts(result) if artifacts else None, started
+            )
+            return result
+
+        return run
+
+    def mark_completed(self, completed=True):
+        with self._lock:
+            self.data["completed"] = completed
+            self._save()
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+def _scan_jobs(parent_dir, job):
+    """(mtime, job dir, manifest data) of each manifest matching `job`."""
+    if not os.path.isdir(parent_dir):
+        return []
+    matches = []
+    for entry in os.scandir(parent_dir):
+        path = os.path.join(entry.path, MANIFEST_NAME)
+        if not entry.is_dir() or not os.path.exists(path):
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        recorded = data.get("job", {})
+        if all(recorded.get(k) == v for k, v in job.items()):
+            matches.append((os.path.getmtime(path), entry.path, data))
+    return matches
+
+
+def find_latest_job(parent_dir, incomplete_only=False, **job):
+    """
+    Newest job directory under `parent_dir` whose manifest describes the same job
+    (every given key/value matches), or None. With `incomplete_only`, jobs
+    marked completed are skipped.
+    """
+    candidates = [
+        (mtime, path)
+        for mtime, path, data in _scan_jobs(parent_dir, job)
+        if not (incomplete_only and data.get("completed"))
+    ]
+    return max(candidates)[1] if candidates else None
+
+
+def find_incomplete_jobs(parent_dir, **job):
+    """
+    The recorded job descriptions of every interrupted (not completed) job under
+    `parent_dir` matching `job`, in one scan of the directory.
+    """
+    return [
+        data.get("job", {})
+        for _, _, data in _scan_jobs(parent_dir, job)
+        if not data.get("completed")
+    ]
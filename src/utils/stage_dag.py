@@ -0,0 +1,93 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+logger = logging.getLogger("stage_dag")
+
+
+class StageFailed(Exception):
+    """Raised when a pipeline step cannot produce its output."""
+
+
+class StageDAG:
+    """
+    Runs named pipeline stages as soon as the stages they depend on are done,
+    independent branches in parallel on a thread pool.
+
+    A stage is a callable taking the results of its dependencies as keyword
+    arguments (by stage name) and returning its own result. If a stage raises,
+    nothing new is started and `run` re-raises the error once running stages finish.
+    Start/end timestamps of every stage are kept in `timings`.
+    """
+
+    def __init__(self, name="pipeline", max_workers=4):
+        self.name = name
+        self.max_workers = max_workers
+        self.stages = {}
+        self.results = {}
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, fn, deps=()):
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self.stages[name] = (fn, tuple(deps))
+        return self
+
+    def _run_stage(self, name):
+        fn, deps = self.stages[name]
+        start = time.time()
+        with self._lock:
+            self.timings[name] = {"start": start, "end": None, "seconds": None}
+        logger.info(f"[{self.name}] Stage '{name}' started")
+        try:
+            return fn(**{dep: self.results[dep] for dep in deps})
+        finally:
+            end = time.time()
+            with self._lock:
+                self.timings[name].update(end=end, seconds=round(end - start, 2))
+            logger.info(f"[{self.name}] Stage '{name}' finished in {end - start:.1f}s")
+
+    def run(self):
+        """Runs every stage; returns the results by stage name."""
+        pending = dict(self.stages)
+        running = {}
+        error = None
+        started = time.time()
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=self.name
+        ) as pool:
+            while pending or running:
+                if error is None:
+                    for name, (_, deps) in list(pending.items()):
+                        if all(dep in self.results for dep in deps):
+                            running[pool.submit(self._run_stage, name)] = name
+                            del pending[name]
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"[{self.name}] Stage '{name}' failed: {e}")
+                        error = error or e
+
+        self._log_summary(time.time() - started)
+        if error is not None:
+            raise error
+        return self.results
+
+    def _log_summary(self, wall):
+        total = sum(t["seconds"] or 0 for t in self.timings.values())
+        stages = ", ".join(
+            f"{name} {t['seconds']}s" for name, t in self.timings.items()
+        )
+        logger.info(
+            f"[{self.name}] {stages} | wall {wall:.1f}s vs {total:.1f}s sequential"
+        )
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Support 'from src...' imports however pytest is invoked
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
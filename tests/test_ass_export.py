@@ -0,0 +1,73 @@
+import subprocess
+
+import pytest
+
+from src.rendering import ass_export
+from src.rendering.ass_export import ass_filter, escape_filter_path, write_ass
+from src.rendering.ffmpeg_backend import get_ffmpeg_exe
+from src.rendering.governor import RenderGovernor
+
+# Special to the filtergraph parser, the option parser, or both
+AWKWARD_DIR = "it's [a], b; c:d"
+
+
+def test_escape_filter_path_escapes_each_level_once():
+    assert escape_filter_path("/tmp/it's.ass") == r"/tmp/it\\\'s.ass"
+    assert escape_filter_path("/tmp/a:b.ass") == r"/tmp/a\\:b.ass"
+    assert escape_filter_path("/tmp/[a],b;c.ass") == r"/tmp/\[a\]\,b\;c.ass"
+
+
+def _has_ass_filter(ffmpeg):
+    result = subprocess.run(
+        [ffmpeg, "-hide_banner", "-filters"], capture_output=True, text=True
+    )
+    return any(line.split()[1:2] == ["ass"] for line in result.stdout.splitlines())
+
+
+@pytest.mark.parametrize("option", ["-vf", "-filter_complex"])
+def test_ass_filter_reads_path_with_quote(tmp_path, option):
+    ffmpeg = get_ffmpeg_exe()
+    if not _has_ass_filter(ffmpeg):
+        pytest.skip("ffmpeg built without libass")
+    subs_dir = tmp_path / AWKWARD_DIR
+    subs_dir.mkdir()
+    ass_path = write_ass(
+        [{"word": "hello", "start": 0.0, "end": 0.5}],
+        str(subs_dir / "subs.ass"),
+        width=320,
+        height=240,
+    )
+
+    result = subprocess.run(
+        [ffmpeg, "-hide_banner", "-loglevel", "debug"]
+        + ["-f", "lavfi", "-i", "color=s=320x240:d=0.5"]
+        + [option, ass_filter(ass_path, str(subs_dir)), "-f", "null", "-"],
+        capture_output=True,
+        text=True,
+    )
+
+    # A mangled path fails to open ("Could not create a libass track")
+    assert result.returncode == 0, result.stderr[-1000:]
+    assert f"Setting 'filename' to value '{ass_path}'" in result.stderr
+
+
+def test_burn_subtitles_encodes_under_a_governor_lease(monkeypatch):
+    governor = RenderGovernor(cpu_count=6, max_concurrent=2)
+    commands = []
+    active = []
+
+    def run_ffmpeg(cmd):
+        active.append(governor.active)
+        commands.append(cmd)
+
+    monkeypatch.setattr(ass_export, "get_render_governor", lambda: governor)
+    monkeypatch.setattr(ass_export, "run_ffmpeg", run_ffmpeg)
+
+    ass_export.burn_subtitles("in.mp4", "subs.ass", "out.mp4")
+    ass_export.burn_subtitles("in.mp4", "subs.ass", "out.mp4", threads=1)
+
+    # Only the call without `threads` takes a lease, and releases it
+    assert active == [1, 0]
+    assert governor.active == 0
+    threads = [cmd[cmd.index("-threads") + 1] for cmd in commands]
+    assert threads == ["3", "1"]
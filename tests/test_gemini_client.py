@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("google.api_core")
+
+from src.gen.gemini_client import (  # noqa: E402
+    AsyncGeminiClient,
+    get_client_loop,
+    run_sync,
+)
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Answers after a short delay, recording the loop and peak concurrency."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.loops = set()
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.loops.add(asyncio.get_running_loop())
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("transient")
+            return FakeResponse(prompt)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def make_client(model, max_concurrency=2):
+    return AsyncGeminiClient(
+        model,
+        max_concurrency=max_concurrency,
+        requests_per_minute=0,
+        backoff_base=0.01,
+        backoff_max=0.01,
+    )
+
+
+def test_client_works_across_event_loops():
+    model = FakeModel()
+    client = make_client(model)
+
+    async def burst(tag):
+        responses = await asyncio.gather(
+            *(client.generate(f"{tag}{i}") for i in range(4))
+        )
+        return [response.text for response in responses]
+
+    # Each asyncio.run creates (and closes) its own loop, like server.py's tasks
+    assert asyncio.run(burst("a")) == ["a0", "a1", "a2", "a3"]
+    assert asyncio.run(burst("b")) == ["b0", "b1", "b2", "b3"]
+    assert model.loops == {get_client_loop()}
+    assert model.peak == 2
+    assert client.stats()["calls"] == 8
+
+
+def test_concurrency_limit_holds_across_threads():
+    model = FakeModel()
+    client = make_client(model, max_concurrency=1)
+    results = []
+
+    def worker(tag):
+        results.append(asyncio.run(client.generate(tag)).text)
+        results.append(run_sync(client.generate(tag + "-sync")).text)
+
+    threads = [threading.Thread(target=worker, args=(str(i),)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == ["0", "0-sync", "1", "1-sync", "2", "2-sync"]
+    assert model.peak == 1
+
+
+def test_transient_errors_are_retried():
+    model = FakeModel(failures=2)
+    client = make_client(model)
+
+    assert run_sync(client.generate("x")).text == "x"
+    stats = client.stats()
+    assert (stats["calls"], stats["retries"], stats["failures"]) == (1, 2, 0)
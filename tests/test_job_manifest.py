@@ -0,0 +1,190 @@
+import json
+import os
+
+from src.utils.job_manifest import (
+    MANIFEST_NAME,
+    JobManifest,
+    find_incomplete_jobs,
+    find_latest_job,
+)
+from src.utils.stage_dag import StageDAG
+
+
+class Pipeline:
+    """Two checkpointed stages, script -> audio, counting how often each runs."""
+
+    def __init__(self, job_dir):
+        self.job_dir = job_dir
+        self.calls = {"script": 0, "audio": 0}
+
+    def script(self):
+        self.calls["script"] += 1
+        return {"script": self.text}
+
+    def audio(self, script):
+        self.calls["audio"] += 1
+        path = os.path.join(self.job_dir, "voiceover.mp3")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(script["script"])
+        return path
+
+    def run(self, text="hello", topic="t", voice="a", resume=True):
+        self.text = text
+        manifest = JobManifest(self.job_dir, job={"topic": "t"})
+        dag = StageDAG()
+        dag.add(
+            "script",
+            manifest.checkpoint("script", self.script, {"topic": topic}, resume=resume),
+        )
+        dag.add(
+            "audio",
+            manifest.checkpoint(
+                "audio",
+                self.audio,
+                {"voice": voice},
+                artifacts=lambda path: [path],
+                resume=resume,
+            ),
+            deps=["script"],
+        )
+        return dag.run()
+
+
+def test_resume_skips_stages_done_for_the_same_inputs(tmp_path):
+    pipeline = Pipeline(str(tmp_path))
+    first = pipeline.run()
+    second = pipeline.run()
+
+    assert second == first
+    assert pipeline.calls == {"script": 1, "audio": 1}
+
+
+def test_without_resume_every_stage_runs(tmp_path):
+    pipeline = Pipeline(str(tmp_path))
+    pipeline.run()
+    pipeline.run(resume=False)
+
+    assert pipeline.calls == {"script": 2, "audio": 2}
+
+
+def test_changed_params_redo_the_stage(tmp_path):
+    pipeline = Pipeline(str(tmp_path))
+    pipeline.run()
+    pipeline.run(voice="b")
+
+    assert pipeline.calls == {"script": 1, "audio": 2}
+
+
+def test_inputs_key_chains_through_dependency_digests(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    before = manifest.inputs_key({"voice": "a"}, ["script"])
+    manifest.record("script", manifest.inputs_key({}), {"script": "one"})
+    after_one = manifest.inputs_key({"voice": "a"}, ["script"])
+    manifest.record("script", manifest.inputs_key({}), {"script": "two"})
+    after_two = manifest.inputs_key({"voice": "a"}, ["script"])
+
+    assert len({before, after_one, after_two}) == 3
+    # Same params and dependency digests, same key
+    assert manifest.inputs_key({"voice": "a"}, ["script"]) == after_two
+
+
+def test_redone_upstream_stage_invalidates_downstream(tmp_path):
+    pipeline = Pipeline(str(tmp_path))
+    pipeline.run()
+    # Only the script's params change, but its new result changes audio's key
+    pipeline.run(text="changed", topic="t2")
+
+    assert pipeline.calls == {"script": 2, "audio": 2}
+    with open(tmp_path / "voiceover.mp3", encoding="utf-8") as f:
+        assert f.read() == "changed"
+
+
+def test_changed_artifact_size_redoes_the_stage(tmp_path):
+    pipeline = Pipeline(str(tmp_path))
+    pipeline.run()
+    with open(tmp_path / "voiceover.mp3", "a", encoding="utf-8") as f:
+        f.write(" appended")
+    pipeline.run()
+
+    assert pipeline.calls == {"script": 1, "audio": 2}
+
+
+def test_changed_artifact_mtime_redoes_the_stage(tmp_path):
+    pipeline = Pipeline(str(tmp_path))
+    pipeline.run()
+    path = tmp_path / "voiceover.mp3"
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    pipeline.run()
+
+    assert pipeline.calls == {"script": 1, "audio": 2}
+
+
+def test_missing_artifact_redoes_the_stage(tmp_path):
+    pipeline = Pipeline(str(tmp_path))
+    pipeline.run()
+    os.remove(tmp_path / "voiceover.mp3")
+    pipeline.run()
+
+    assert pipeline.calls == {"script": 1, "audio": 2}
+
+
+def test_unreadable_manifest_starts_fresh(tmp_path):
+    (tmp_path / MANIFEST_NAME).write_text("{not json", encoding="utf-8")
+    manifest = JobManifest(str(tmp_path), job={"topic": "t"})
+
+    assert manifest.data == {"job": {"topic": "t"}, "completed": False, "stages": {}}
+
+
+def _make_job(parent, name, mtime, completed=False, **job):
+    job_dir = parent / name
+    job_dir.mkdir()
+    path = job_dir / MANIFEST_NAME
+    data = {"job": job, "completed": completed, "stages": {}}
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+    return str(job_dir)
+
+
+def test_find_latest_job_matches_every_given_key(tmp_path):
+    old = _make_job(tmp_path, "old", 1000, topic="cats", language="ru")
+    new = _make_job(tmp_path, "new", 2000, topic="cats", language="ru")
+    _make_job(tmp_path, "newer_en", 3000, topic="cats", language="en")
+    _make_job(tmp_path, "other", 4000, topic="dogs", language="ru")
+
+    assert find_latest_job(str(tmp_path), topic="cats", language="ru") == new
+    assert find_latest_job(str(tmp_path), topic="cats", language="de") is None
+    assert find_latest_job(str(tmp_path), topic="cats") == str(tmp_path / "newer_en")
+
+    os.utime(os.path.join(old, MANIFEST_NAME), (5000, 5000))
+    assert find_latest_job(str(tmp_path), topic="cats", language="ru") == old
+
+
+def test_find_latest_job_incomplete_only(tmp_path):
+    interrupted = _make_job(tmp_path, "a", 1000, topic="cats")
+    _make_job(tmp_path, "b", 2000, completed=True, topic="cats")
+
+    assert find_latest_job(str(tmp_path), topic="cats") == str(tmp_path / "b")
+    assert find_latest_job(str(tmp_path), incomplete_only=True, topic="cats") == (
+        interrupted
+    )
+
+
+def test_find_latest_job_skips_unreadable_manifests(tmp_path):
+    good = _make_job(tmp_path, "good", 1000, topic="cats")
+    bad = tmp_path / "bad"
+    bad.mkdir()
+    (bad / MANIFEST_NAME).write_text("{", encoding="utf-8")
+    (tmp_path / "no_manifest").mkdir()
+
+    assert find_latest_job(str(tmp_path), topic="cats") == good
+    assert find_latest_job(str(tmp_path / "missing"), topic="cats") is None
+
+
+def test_find_incomplete_jobs(tmp_path):
+    _make_job(tmp_path, "a", 1000, topic="cats", channel="A")
+    _make_job(tmp_path, "b", 2000, completed=True, topic="dogs", channel="A")
+    _make_job(tmp_path, "c", 3000, topic="birds", channel="B")
+
+    jobs = find_incomplete_jobs(str(tmp_path), channel="A")
+    assert jobs == [{"topic": "cats", "channel": "A"}]
@@ -0,0 +1,77 @@
+import numpy as np
+
+from src.rendering.overlays import SubtitleOverlay
+
+
+def make_sprite(h, w, rgb, alpha):
+    sprite = np.zeros((h, w, 4), dtype=np.uint8)
+    sprite[:, :, :3] = rgb
+    sprite[:, :, 3] = alpha
+    return sprite
+
+
+def reference_blend(frame, sprite, y, x):
+    """Straight float alpha blend, rounded: what the integer blend must match."""
+    out = frame.astype(np.float64)
+    h, w = sprite.shape[:2]
+    alpha = sprite[:, :, 3:4] / 255.0
+    region = out[y : y + h, x : x + w]
+    out[y : y + h, x : x + w] = sprite[:, :, :3] * alpha + region * (1 - alpha)
+    return np.floor(out + 0.5).astype(np.uint8)
+
+
+def test_active_index_follows_word_times():
+    words = [
+        {"word": "a", "start": 0.0, "end": 0.5},
+        {"word": "b", "start": 1.0, "end": 1.02},
+        {"word": "c", "start": 2.0, "end": 3.0},
+    ]
+    sprite = make_sprite(2, 2, 255, 255)
+    overlay = SubtitleOverlay(words, [sprite, sprite, None], (8, 8))
+
+    assert len(overlay) == 2
+    assert overlay.active_index(0.0) == 0
+    assert overlay.active_index(0.49) == 0
+    assert overlay.active_index(0.5) is None
+    # Short words stay on screen for min_duration
+    assert overlay.active_index(1.09) == 1
+    assert overlay.active_index(1.1) is None
+    # A word without a sprite is skipped
+    assert overlay.active_index(2.5) is None
+    assert overlay.active_index(-1.0) is None
+
+
+def test_blend_matches_rounded_float_blend():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(10, 12, 3), dtype=np.uint8)
+    sprite = rng.integers(0, 256, size=(4, 6, 4), dtype=np.uint8)
+    overlay = SubtitleOverlay([{"start": 0.0, "end": 1.0}], [sprite], (12, 10))
+
+    out = overlay.blend(frame, 0.5)
+
+    # Centered: rows 3..7, columns 3..9
+    np.testing.assert_array_equal(out, reference_blend(frame, sprite, 3, 3))
+    assert out.dtype == np.uint8
+    # The input frame is left untouched
+    assert not np.shares_memory(out, frame)
+
+
+def test_blend_without_active_word_returns_frame():
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    sprite = make_sprite(2, 2, 255, 255)
+    overlay = SubtitleOverlay([{"start": 1.0, "end": 2.0}], [sprite], (4, 4))
+
+    assert overlay.blend(frame, 0.5) is frame
+
+
+def test_blend_accepts_non_uint8_frames():
+    # MoviePy's ColorClip (the black fill) produces int64 frames
+    frame = np.zeros((6, 6, 3), dtype=np.int64)
+    sprite = make_sprite(2, 2, (200, 100, 50), 255)
+    overlay = SubtitleOverlay([{"start": 0.0, "end": 1.0}], [sprite], (6, 6))
+
+    out = overlay.blend(frame, 0.5)
+
+    assert out.dtype == np.uint8
+    np.testing.assert_array_equal(out[2:4, 2:4], [[[200, 100, 50]] * 2] * 2)
+    assert out[0, 0].tolist() == [0, 0, 0]
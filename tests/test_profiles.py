@@ -0,0 +1,40 @@
+import pytest
+
+from src.rendering.profiles import (
+    DEFAULT_PROFILE,
+    LEGACY_PROFILE,
+    PROFILES,
+    benchmark_summary,
+    get_profile,
+)
+
+
+@pytest.mark.parametrize("name", [None, ""])
+def test_no_name_gives_default_profile(name):
+    assert get_profile(name).name == DEFAULT_PROFILE
+
+
+@pytest.mark.parametrize("name", ["medium", "high", "HQ"])
+def test_unknown_quality_gives_legacy_profile(name):
+    assert get_profile(name).name == LEGACY_PROFILE == "hard"
+
+
+def test_profile_names_are_case_insensitive():
+    assert get_profile("Upload") is PROFILES["upload"]
+
+
+def test_benchmark_summary_needs_matching_settings(monkeypatch):
+    profile = PROFILES["easy"]
+    recorded = {
+        "settings": profile.to_dict(),
+        "encode_fps": 9.6,
+        "realtime_factor": 0.4,
+        "bitrate_kbps": 5899,
+    }
+    monkeypatch.setattr(
+        "src.rendering.profiles.load_benchmarks", lambda: {"easy": recorded}
+    )
+    assert "9.6 fps" in benchmark_summary(profile)
+
+    recorded["settings"] = dict(recorded["settings"], crf=18)
+    assert benchmark_summary(profile) is None
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+from src.gen.script_generator import SceneStreamParser  # noqa: E402
+
+SCRIPT = {
+    "title": 'A "quoted" {title}',
+    "script": "Braces } and brackets ] inside strings, and an escaped \\ too",
+    "scenes": [
+        {"text": 'He said "hi" {', "keywords": ["a", "b"]},
+        {"text": "nested", "keywords": [["x"], {"y": "]"}]},
+        {"text": 'last \\" one', "keywords": []},
+    ],
+}
+
+
+def _feed_all(parser, text, size):
+    scenes = []
+    for i in range(0, len(text), size):
+        scenes.extend(parser.feed(text[i : i + size]))
+    return scenes
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1000])
+def test_scenes_from_split_chunks(size):
+    text = json.dumps(SCRIPT)
+    scenes = _feed_all(SceneStreamParser(), text, size)
+    assert scenes == list(enumerate(SCRIPT["scenes"]))
+
+
+def test_scene_is_returned_by_the_chunk_that_completes_it():
+    text = json.dumps(SCRIPT)
+    first_end = text.index("}", text.index('"scenes"')) + 1
+    parser = SceneStreamParser()
+    assert parser.feed(text[: first_end - 1]) == []
+    assert parser.feed(text[first_end - 1 : first_end]) == [(0, SCRIPT["scenes"][0])]
+
+
+def test_unparsable_scene_keeps_later_indices():
+    text = '{"scenes": [{"text": "a"}, {"text": oops}, {"text": "c"}]}'
+    scenes = _feed_all(SceneStreamParser(), text, 3)
+    assert scenes == [(0, {"text": "a"}), (2, {"text": "c"})]
+
+
+def test_arrays_outside_scenes_are_ignored():
+    text = '{"keywords": [{"text": "no"}], "scenes": [{"text": "yes"}], "x": [{}]}'
+    assert SceneStreamParser().feed(text) == [(0, {"text": "yes"})]
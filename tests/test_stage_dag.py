@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from src.utils.stage_dag import StageDAG, StageFailed
+
+
+def test_dependency_results_are_passed_by_stage_name():
+    dag = StageDAG()
+    dag.add("script", lambda: "text")
+    dag.add("audio", lambda script: f"audio({script})", deps=["script"])
+    dag.add("visuals", lambda script: f"visuals({script})", deps=["script"])
+    dag.add(
+        "render",
+        lambda audio, visuals: f"render({audio}, {visuals})",
+        deps=["audio", "visuals"],
+    )
+
+    results = dag.run()
+
+    assert results["render"] == "render(audio(text), visuals(text))"
+    assert set(dag.timings) == {"script", "audio", "visuals", "render"}
+
+
+def test_independent_stages_run_in_parallel():
+    # Each branch waits for the other, so this only passes if both run at once
+    barrier = threading.Barrier(2, timeout=5)
+    dag = StageDAG(max_workers=2)
+    dag.add("a", lambda: barrier.wait() is not None)
+    dag.add("b", lambda: barrier.wait() is not None)
+
+    assert dag.run() == {"a": True, "b": True}
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError, match="unknown stage 'script'"):
+        StageDAG().add("audio", lambda script: None, deps=["script"])
+
+
+def test_failure_is_reraised_and_stops_downstream_stages():
+    started = []
+    sibling_running = threading.Event()
+
+    def stage(name, fn=None):
+        def run(**deps):
+            started.append(name)
+            return fn() if fn else name
+
+        return run
+
+    def fail():
+        # Fail while the sibling branch is still running
+        sibling_running.wait(5)
+        raise StageFailed("Failed to generate voiceover.")
+
+    def sibling():
+        sibling_running.set()
+        return "visuals"
+
+    dag = StageDAG(max_workers=2)
+    dag.add("script", stage("script"))
+    dag.add("audio", stage("audio", fail), deps=["script"])
+    dag.add("subtitles", stage("subtitles"), deps=["audio"])
+    dag.add("visuals", stage("visuals", sibling), deps=["script"])
+    dag.add("render", stage("render"), deps=["subtitles", "visuals"])
+
+    with pytest.raises(StageFailed, match="voiceover"):
+        dag.run()
+
+    # The running sibling finishes; nothing downstream of the failure starts
+    assert sorted(started) == ["audio", "script", "visuals"]
+    assert dag.results == {"script": "script", "visuals": "visuals"}
+    assert dag.timings["audio"]["end"] is not None